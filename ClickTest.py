@@ -6,7 +6,8 @@ import time
 from fuzzywuzzy import fuzz
 from fuzzywuzzy import process
 
-from vector_db import initialize_vector_db
+from retrieval_daemon import load_shared_vector_db
+from vector_db import VectorDBLoader
 
 
 class Action(Enum):
@@ -20,7 +21,7 @@ ELEMENT_CACHE = {}
 CURRENT_PAGE = None
 LAST_ACTION_TIME = 0
 
-VECTOR_DB = initialize_vector_db()
+VECTOR_DB = VectorDBLoader(load_shared_vector_db)
 
 
 def get_navigation_plan(user_prompt: str) -> Dict:
@@ -33,10 +34,8 @@ def get_navigation_plan(user_prompt: str) -> Dict:
     Returns:
         Dict: A dictionary containing the action plan with steps
     """
-    # Get similar examples from vector database
-    similar_examples = VECTOR_DB.get_similar_examples(user_prompt)
-    # Return the first matching plan if found, otherwise return empty plan
-    return similar_examples[0]["plan"] if similar_examples else {"steps": []}
+    # Exact and course-code matches skip the vector search; returns an empty plan if nothing matched
+    return VECTOR_DB.get().get_plan(user_prompt)
 
 def get_cache_key(url: str, element_description: str) -> str:
     return f"{url}|||{element_description.lower().strip()}"
@@ -389,6 +388,8 @@ def get_active_page(context):
 
 
 def interactive_angular_navigator():
+    # Load the encoder while connecting to the browser
+    VECTOR_DB.start()
     with sync_playwright() as p:
         browser = p.chromium.connect_over_cdp("http://127.0.0.1:9222")
         context = browser.contexts[0]
@@ -0,0 +1,138 @@
+"""
+Benchmark of find_course_element on generated course lists.
+
+Loads 50-500 course cards into a headless Chromium page with set_content and
+times the single in-page search against the original strategy loop (eight
+query_selector + is_visible round trips, then inner_text on every course card
+and its children), checking that both find the same element.
+
+    python -m playwright install chromium
+    python benchmark_course_search.py --sizes 50 100 250 500
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from playwright.sync_api import sync_playwright
+
+from vectorDBClicksIntegrated import find_course_element
+
+SUBJECTS = ["COMP", "CSSE", "INFS", "DECO", "MATH", "STAT", "ENGG", "ELEC", "BIOL", "ECON"]
+TITLES = ["Algorithms & Data Structures", "Software Engineering", "Relational Database Systems",
+          "Interaction Design", "Calculus & Linear Algebra", "Statistical Modelling",
+          "Engineering Design", "Signals & Systems", "Cell Biology", "Microeconomics"]
+
+
+def make_page(count: int, rng: random.Random):
+    """Course list markup in the shape of Ultra's course cards, and the codes on it"""
+    codes = []
+    cards = []
+    for i in range(count):
+        code = f"{rng.choice(SUBJECTS)}{1000 + i:04d}"
+        codes.append(code)
+        # Some cards write the code with a space, like "COMP 3506"
+        shown = f"{code[:4]} {code[4:]}" if i % 7 == 3 else code
+        cards.append(f"""
+        <div class="course-card" id="course-card-{i}">
+          <a href="/ultra/courses/_{100000 + i}_1/outline">
+            <h4 class="course-title">{shown} {rng.choice(TITLES)}</h4>
+          </a>
+          <div class="course-meta"><span>Semester 2, 2025</span><span>St Lucia, Internal</span></div>
+          <ul class="course-links"><li><a href="#">Announcements</a></li><li><a href="#">Grades</a></li></ul>
+        </div>""")
+    html = f"<html><body><nav><a href='#'>Courses</a></nav><main>{''.join(cards)}</main></body></html>"
+    return html, codes
+
+
+def legacy_find_course_element(page, course_code: str):
+    """The original find_course_element strategy loop"""
+    clean_code = course_code.replace('[', '').replace(']', '').replace(' ', '').upper()
+    selectors = [
+        f'[title*="{clean_code}"]',
+        f'[aria-label*="{clean_code}"]',
+        f'[data-course-id*="{clean_code}"]',
+        f'[id*="{clean_code.lower()}"]',
+        f'[class*="course-{clean_code.lower()}"]',
+        f'[href*="{clean_code.lower()}"]',
+        f'text=/.*{clean_code}.*/i',
+        f'text=/.*{clean_code[:4]}.*{clean_code[4:]}.*/i'
+    ]
+    for selector in selectors:
+        try:
+            element = page.query_selector(selector)
+            if element and element.is_visible():
+                return element
+        except:
+            continue
+
+    try:
+        course_containers = page.query_selector_all(
+            '.course-card, [class*="course-node"], .course-item, .course-list-item')
+        for container in course_containers:
+            if not container.is_visible():
+                continue
+            text = container.inner_text().upper().replace(' ', '')
+            if clean_code in text:
+                return container
+            for child in container.query_selector_all('*'):
+                try:
+                    child_text = child.inner_text().upper().replace(' ', '')
+                    if clean_code in child_text:
+                        return child
+                except:
+                    continue
+    except:
+        pass
+    return None
+
+
+def time_lookup(fn, page, code: str, repeat: int):
+    # find_course_element logs every hit, which would bury the table
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(page, code)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(page, code)
+        elapsed = time.perf_counter() - start
+    return elapsed / repeat * 1000, result
+
+
+def same_element(page, a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return page.evaluate("([a, b]) => a === b", [a, b])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        print(f"{'cards':>6} {'lookup':>10} {'old ms':>9} {'new ms':>9} {'same':>5}")
+        for size in args.sizes:
+            html, codes = make_page(size, rng)
+            page.set_content(html)
+            lookups = {
+                "first": codes[0],
+                "last": codes[-1],
+                "spaced": codes[3],
+                "missing": "ZZZZ9999"
+            }
+            for name, code in lookups.items():
+                old_ms, old = time_lookup(legacy_find_course_element, page, code, args.repeat)
+                new_ms, new = time_lookup(find_course_element, page, code, args.repeat)
+                same = same_element(page, old, new)
+                print(f"{size:>6} {name:>10} {old_ms:>9.1f} {new_ms:>9.2f} {'yes' if same else 'no':>5}")
+        browser.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark of element description matching on synthetic candidate lists.
+
+Compares the old per-element loop (three fuzzywuzzy scorers per candidate, or
+rapidfuzz's if fuzzywuzzy is not installed) with element_matching's batch
+scorer, and checks that both pick the same candidate.
+
+    python benchmark_element_matching.py --sizes 1000 10000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from rapidfuzz import fuzz as rapid_fuzz
+
+from element_matching import MATCH_THRESHOLD, best_match, score_texts
+
+try:
+    from fuzzywuzzy import fuzz as loop_fuzz
+    LOOP_LIBRARY = "fuzzywuzzy"
+except ImportError:
+    loop_fuzz = rapid_fuzz
+    LOOP_LIBRARY = "rapidfuzz"
+
+WORDS = [
+    "announcements", "assessment", "course", "profile", "view", "learning", "resources",
+    "tutorial", "week", "lecture", "slides", "discussion", "board", "grades", "submit",
+    "assignment", "report", "code", "launch", "content", "module", "search", "introduction",
+    "design", "computing", "studio", "research", "methods", "project", "artificial",
+    "intelligence", "engineering", "my", "messages", "calendar", "help", "settings", "&",
+]
+DESCRIPTIONS = ["Announcements", "Course Profile", "Assessment & Grades", "Tutorial 3 - Solutions",
+                "Artificial Intelligence", "Launch"]
+
+
+def make_candidates(count: int, rng: random.Random):
+    texts = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(1, 6))
+        if rng.random() < 0.3:
+            words.append(str(rng.randint(1, 12)))
+        texts.append(" ".join(words).title())
+    return texts
+
+
+def loop_match(description: str, texts, threshold: int = MATCH_THRESHOLD):
+    """The original find_element_by_text scoring loop"""
+    best, highest_score = None, 0
+    for i, text in enumerate(texts):
+        score = max(loop_fuzz.ratio(text.lower(), description.lower()),
+                    loop_fuzz.partial_ratio(text.lower(), description.lower()),
+                    loop_fuzz.token_sort_ratio(text.lower(), description.lower()))
+        if score > highest_score and score >= threshold:
+            best, highest_score = i, score
+    return best
+
+
+def time_call(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"loop scorer: {LOOP_LIBRARY}\n")
+    print(f"{'candidates':>10} {'loop ms':>9} {'batch ms':>9} {'1 thread':>9} {'all threads':>11} {'agree':>6}")
+    for size in args.sizes:
+        texts = make_candidates(size, rng)
+        loop_ms = np.mean([time_call(lambda: loop_match(d, texts), 1) for d in DESCRIPTIONS])
+        batch_ms = np.mean([time_call(lambda: best_match(d, texts), args.repeat) for d in DESCRIPTIONS])
+        single_ms = np.mean([time_call(lambda: score_texts(d, texts, workers=1), args.repeat)
+                             for d in DESCRIPTIONS])
+        threaded_ms = np.mean([time_call(lambda: score_texts(d, texts, workers=-1), args.repeat)
+                               for d in DESCRIPTIONS])
+
+        # The loop rounds to integers when run on fuzzywuzzy, so compare scores, not just indexes
+        agree = 0
+        for description in DESCRIPTIONS:
+            expected = loop_match(description, texts)
+            actual, _ = best_match(description, texts)
+            agree += expected == actual
+        print(f"{size:>10} {loop_ms:>9.1f} {batch_ms:>9.2f} {single_ms:>9.2f} {threaded_ms:>11.2f} "
+              f"{agree:>3}/{len(DESCRIPTIONS)}")
+
+
+if __name__ == "__main__":
+    main()
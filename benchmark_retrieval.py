@@ -0,0 +1,390 @@
+"""
+Compare per-query latency of the ExampleVectorDB retrieval backends.
+
+Both backends are filled with the same cached embeddings and queried with
+the same pre-encoded prompts, so only the index lookup is timed.
+
+    python benchmark_retrieval.py --queries 1000 --k 3
+
+With --compare-encoders, the torch and ONNX int8 encoders are each loaded in
+a fresh process instead, reporting load time, peak RSS and per-prompt encode
+latency, and checking that both pick the same top-1 plan for every example.
+
+With --suite, every backend/encoder combination is built from scratch in its
+own process and reports init time, end-to-end get_similar_examples latency,
+throughput, peak RSS and recall@1/@3 on held-out paraphrases and misspellings
+of the shipped examples:
+
+    python benchmark_retrieval.py --suite --backends numpy chroma --encoders torch onnx
+"""
+import argparse
+import json
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from vector_db import (COURSE_SLOT, ENCODER_NAMES, MARGIN_CANDIDATES, MIN_MARGIN, MIN_SIMILARITY, STOPWORDS,
+                       ExampleVectorDB, create_backend, get_courses, get_examples, load_encoder,
+                       match_confidence, normalize_query, plan_hash)
+
+PARAPHRASE_TEMPLATES = [
+    "can you show me {}",
+    "please open {}",
+    "i want to see {}",
+    "take me to {}",
+    "{} please",
+]
+SYNONYMS = {
+    "show": "display",
+    "open": "go to",
+    "view": "see",
+    "check": "look at",
+    "find": "look up",
+    "my": "the",
+}
+# Course codes anywhere in a plan, including file names like "COMP3702_Tutorial_1.pdf"
+PLAN_COURSE_CODE = re.compile(r"(?<![A-Z])[A-Z]{4}\d{4}(?!\d)")
+# Filler around a course-code prompt that must not stop it resolving lexically
+COURSE_CODE_TEMPLATES = [
+    "{} please",
+    "can you show me {}",
+    "i need to see the {} please",
+]
+
+
+def time_queries(backend, embeddings: np.ndarray, k: int) -> np.ndarray:
+    latencies = []
+    for i in range(len(embeddings)):
+        start = time.perf_counter()
+        backend.query(embeddings[i:i + 1], k)
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1000
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def probe_encoder(name: str):
+    """Load one encoder in this process and print its costs and top-1 plans as JSON"""
+    timings = {}
+    start = time.perf_counter()
+    encoder = load_encoder(name, timings)
+    load_seconds = time.perf_counter() - start
+
+    db = ExampleVectorDB(create_backend("numpy"), encoder, encoder_name=ENCODER_NAMES[name])
+    db.load_examples()
+    prompts = [ex["query"] for ex in db.examples]
+    top1 = [matches[0]["plan_id"] for matches in db.get_similar_examples_batch(prompts, k=1)]
+
+    encoder.encode(["warm up"])
+    latencies = []
+    for prompt in prompts:
+        start = time.perf_counter()
+        encoder.encode([prompt])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    print(json.dumps({
+        "encoder": name,
+        "load_s": load_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "prompts": prompts,
+        "top1": top1
+    }))
+
+
+def make_paraphrase(query: str, rng: random.Random) -> str:
+    words = [SYNONYMS.get(word, word) for word in query.lower().split()]
+    return rng.choice(PARAPHRASE_TEMPLATES).format(" ".join(words))
+
+
+def make_typo(query: str, rng: random.Random):
+    """Drop, swap or double one letter of a longer word, e.g. "announcemnt" """
+    words = query.split()
+    candidates = [i for i, word in enumerate(words) if len(word) >= 5 and word.isalpha()]
+    if not candidates:
+        return None
+    i = rng.choice(candidates)
+    word = words[i]
+    pos = rng.randrange(1, len(word) - 1)
+    op = rng.choice(("drop", "swap", "double"))
+    if op == "drop":
+        word = word[:pos] + word[pos + 1:]
+    elif op == "swap":
+        word = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+    else:
+        word = word[:pos] + word[pos] + word[pos:]
+    words[i] = word
+    return " ".join(words)
+
+
+def build_eval_set(examples, seed: int = 0):
+    """
+    Held-out prompts derived from the examples, one paraphrase and one typo each.
+
+    Plan templates are first filled with a random course code, title or
+    alias. Variants that normalize to an indexed prompt are dropped, so none
+    of them can be answered by an exact match. A prompt counts as answered
+    if the expected plan is any plan its source query maps to.
+    """
+    rng = random.Random(seed)
+    course_names = sorted({name for course in get_courses()
+                           for name in [course["code"], course["title"], *course.get("aliases", [])] if name})
+    expected = {}
+    for ex in examples:
+        expected.setdefault(normalize_query(ex["query"]), set()).add(plan_hash(ex["plan"]))
+
+    eval_set = []
+    seen = set(expected)
+    for ex in examples:
+        source = ex["query"].replace(COURSE_SLOT, rng.choice(course_names))
+        for kind, make_variant in (("paraphrase", make_paraphrase), ("typo", make_typo)):
+            query = make_variant(source, rng)
+            if query is None or normalize_query(query) in seen:
+                continue
+            seen.add(normalize_query(query))
+            eval_set.append({
+                "query": query,
+                "kind": kind,
+                "plan_ids": sorted(expected[normalize_query(ex["query"])])
+            })
+    return eval_set
+
+
+def unrestricted_course_templates(examples):
+    """Queries of templates whose plan names a course code but isn't restricted to it with "course_code" """
+    return [ex["query"] for ex in examples
+            if COURSE_SLOT in json.dumps(ex["plan"]) and not ex["plan"].get("course_code")
+            and PLAN_COURSE_CODE.search(json.dumps(ex["plan"]["steps"]))]
+
+
+def probe_suite(backend_name: str, encoder_name: str, seed: int):
+    """Build one backend/encoder combination from scratch and print its report as JSON"""
+    examples = get_examples()
+    eval_set = build_eval_set(examples, seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        encoder = load_encoder(encoder_name)
+        backend = create_backend(backend_name, path=os.path.join(tmp, "chroma"))
+        # No prompt caches and a cold embedding cache, so every lookup pays for encoding
+        db = ExampleVectorDB(backend, encoder, query_cache_size=0, result_cache_size=0,
+                             encoder_name=ENCODER_NAMES[encoder_name],
+                             embedding_cache_dir=os.path.join(tmp, "embeddings"))
+        # Prompts are masked with the course table, as load_examples does for the server
+        db.load_courses()
+        db.sync_examples(examples)
+        encoder.encode(["warm up"])
+        init_seconds = time.perf_counter() - start
+
+        latencies = []
+        hits = {}
+        for item in eval_set:
+            start = time.perf_counter()
+            matches = db.get_similar_examples(item["query"], k=MARGIN_CANDIDATES)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            plan_ids = [match["plan_id"] for match in matches]
+            counts = hits.setdefault(item["kind"], {"total": 0, "at1": 0, "at3": 0, "accepted": 0, "correct": 0})
+            counts["total"] += 1
+            counts["at1"] += bool(set(plan_ids[:1]) & set(item["plan_ids"]))
+            counts["at3"] += bool(set(plan_ids[:3]) & set(item["plan_ids"]))
+
+            # Would match_plan have trusted this semantic match?
+            score, margin = match_confidence(matches)
+            if score >= MIN_SIMILARITY and (margin is None or margin >= MIN_MARGIN):
+                counts["accepted"] += 1
+                counts["correct"] += bool(set(plan_ids[:1]) & set(item["plan_ids"]))
+
+        # A template whose keywords belong to no other template's plan should
+        # resolve lexically with a course code and filler words around it
+        rng = random.Random(seed)
+        codes = sorted(course["code"] for course in get_courses() if course["code"])
+        templates = [(ex, set(normalize_query(ex["query"].replace(COURSE_SLOT, " ")).split()) - STOPWORDS)
+                     for ex in examples if COURSE_SLOT in ex["query"]]
+        plan_keywords = {}
+        for ex, keywords in templates:
+            plan_keywords.setdefault(plan_hash(ex["plan"]), set()).update(keywords)
+        lexical_total = 0
+        lexical_misses = []
+        for ex, keywords in templates:
+            plan_id = plan_hash(ex["plan"])
+            if not keywords or any(keywords & other for other_id, other in plan_keywords.items() if other_id != plan_id):
+                continue
+            filled = ex["query"].replace(COURSE_SLOT, rng.choice(codes))
+            for template in COURSE_CODE_TEMPLATES:
+                query = template.format(filled)
+                match = db.match_plan(query)
+                lexical_total += 1
+                if match["source"] not in ("exact", "course_code") or match["plan_id"] != plan_id:
+                    lexical_misses.append(query)
+
+    total = sum(counts["total"] for counts in hits.values())
+    accepted = sum(counts["accepted"] for counts in hits.values())
+    print(json.dumps({
+        "backend": backend_name,
+        "encoder": encoder_name,
+        "examples": len(db.examples),
+        "queries": total,
+        "init_s": init_seconds,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "qps": len(latencies) / (sum(latencies) / 1000),
+        "peak_rss_mb": peak_rss_mb(),
+        "recall_at_1": sum(counts["at1"] for counts in hits.values()) / total,
+        "recall_at_3": sum(counts["at3"] for counts in hits.values()) / total,
+        "accept_rate": accepted / total,
+        "accepted_precision": sum(counts["correct"] for counts in hits.values()) / accepted if accepted else None,
+        "lexical_queries": lexical_total,
+        "lexical_misses": lexical_misses,
+        "by_kind": {kind: {"queries": counts["total"],
+                           "recall_at_1": counts["at1"] / counts["total"],
+                           "recall_at_3": counts["at3"] / counts["total"]}
+                    for kind, counts in hits.items()}
+    }))
+
+
+def run_suite(backends, encoders, seed: int, output=None):
+    reports = []
+    for encoder_name in encoders:
+        for backend_name in backends:
+            child = subprocess.run([sys.executable, __file__, "--probe-suite",
+                                    f"{backend_name}:{encoder_name}", "--seed", str(seed)],
+                                   capture_output=True, text=True)
+            if child.returncode != 0:
+                print(f"{backend_name}/{encoder_name} failed:\n{child.stderr}")
+                continue
+            reports.append(json.loads(child.stdout.strip().splitlines()[-1]))
+    if not reports:
+        return 1
+
+    print(f"{reports[0]['examples']} examples, {reports[0]['queries']} held-out queries (seed {seed})")
+    print(f"accept = share of semantic matches passing similarity >= {MIN_SIMILARITY} and margin >= {MIN_MARGIN}; "
+          f"prec = R@1 among those\n")
+    print(f"{'backend':<8} {'encoder':<8} {'init s':>7} {'p50 ms':>7} {'p95 ms':>7} {'q/s':>7} "
+          f"{'RSS MB':>7} {'R@1':>6} {'R@3':>6} {'accept':>6} {'prec':>6}")
+    for report in reports:
+        precision = report["accepted_precision"]
+        print(f"{report['backend']:<8} {report['encoder']:<8} {report['init_s']:>7.2f} "
+              f"{report['p50_ms']:>7.2f} {report['p95_ms']:>7.2f} {report['qps']:>7.0f} "
+              f"{report['peak_rss_mb']:>7.0f} {report['recall_at_1']:>6.3f} {report['recall_at_3']:>6.3f} "
+              f"{report['accept_rate']:>6.3f} {precision if precision is not None else float('nan'):>6.3f}")
+
+    print(f"\n{'backend':<8} {'encoder':<8} {'kind':<11} {'queries':>7} {'R@1':>6} {'R@3':>6}")
+    for report in reports:
+        for kind, recall in sorted(report["by_kind"].items()):
+            print(f"{report['backend']:<8} {report['encoder']:<8} {kind:<11} {recall['queries']:>7} "
+                  f"{recall['recall_at_1']:>6.3f} {recall['recall_at_3']:>6.3f}")
+
+    print("\nCourse-code prompts with extra words resolved lexically:")
+    for report in reports:
+        resolved = report["lexical_queries"] - len(report["lexical_misses"])
+        print(f"{report['backend']:<8} {report['encoder']:<8} {resolved}/{report['lexical_queries']}")
+        for query in report["lexical_misses"]:
+            print(f"  missed: {query}")
+
+    unrestricted = unrestricted_course_templates(get_examples())
+    if unrestricted:
+        print("\nTemplates that would run another course's steps for any course:")
+        for query in unrestricted:
+            print(f"  {query}")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nWrote {output}")
+    return 1 if unrestricted or any(report["lexical_misses"] for report in reports) else 0
+
+
+def compare_encoders():
+    reports = {}
+    for name in ("torch", "onnx"):
+        child = subprocess.run([sys.executable, __file__, "--probe-encoder", name],
+                               capture_output=True, text=True)
+        if child.returncode != 0:
+            print(f"{name} encoder failed:\n{child.stderr}")
+            return 1
+        reports[name] = json.loads(child.stdout.strip().splitlines()[-1])
+
+    print(f"{'encoder':<8} {'load s':>8} {'peak RSS MB':>12} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, report in reports.items():
+        print(f"{name:<8} {report['load_s']:>8.2f} {report['peak_rss_mb']:>12.0f} "
+              f"{report['p50_ms']:>8.2f} {report['p95_ms']:>8.2f}")
+
+    torch_report, onnx_report = reports["torch"], reports["onnx"]
+    mismatches = [prompt for prompt, expected, actual
+                  in zip(torch_report["prompts"], torch_report["top1"], onnx_report["top1"])
+                  if expected != actual]
+    total = len(torch_report["prompts"])
+    print(f"\nTop-1 plan agreement: {total - len(mismatches)}/{total}")
+    for prompt in mismatches:
+        print(f"  differs: {prompt}")
+    return 1 if mismatches else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=1000, help="number of timed queries")
+    parser.add_argument("--k", type=int, default=3, help="results per query")
+    parser.add_argument("--compare-encoders", action="store_true",
+                        help="compare the torch and ONNX int8 encoders instead of backends")
+    parser.add_argument("--suite", action="store_true",
+                        help="report init time, latency, throughput, memory and recall per backend/encoder")
+    parser.add_argument("--backends", nargs="+", default=["numpy", "chroma"], help="backends for --suite")
+    parser.add_argument("--encoders", nargs="+", default=["torch"], help="encoders for --suite")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the held-out typos and paraphrases")
+    parser.add_argument("--output", help="also write the --suite reports to this JSON file")
+    parser.add_argument("--probe-encoder", help=argparse.SUPPRESS)
+    parser.add_argument("--probe-suite", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe_encoder:
+        probe_encoder(args.probe_encoder)
+        return
+    if args.probe_suite:
+        backend_name, encoder_name = args.probe_suite.split(":")
+        probe_suite(backend_name, encoder_name, args.seed)
+        return
+    if args.suite:
+        sys.exit(run_suite(args.backends, args.encoders, args.seed, args.output))
+    if args.compare_encoders:
+        sys.exit(compare_encoders())
+
+    examples = get_examples()
+    with tempfile.TemporaryDirectory() as chroma_dir:
+        backends = {
+            "numpy": create_backend("numpy"),
+            "chroma": create_backend("chroma", path=chroma_dir),
+        }
+        encoder = None
+        for backend in backends.values():
+            db = ExampleVectorDB(backend, encoder)
+            encoder = db.encoder
+            db.sync_examples(examples)
+
+        prompts = [ex["query"] for ex in examples]
+        prompts = [prompts[i % len(prompts)] for i in range(args.queries)]
+        embeddings = db.encode(prompts)
+
+        print(f"\n{len(db.examples)} examples, {args.queries} queries, k={args.k}")
+        print(f"{'backend':<8} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, backend in backends.items():
+            backend.query(embeddings[:1], args.k)  # warm up
+            latencies = time_queries(backend, embeddings, args.k)
+            print(f"{name:<8} {latencies.mean():>8.3f} {np.percentile(latencies, 50):>8.3f} "
+                  f"{np.percentile(latencies, 95):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
-from vector_db import initialize_vector_db
+from retrieval_daemon import load_shared_vector_db
+from vector_db import VectorDBLoader
 from playwright.sync_api import sync_playwright
 import json
 import time
 from enum import Enum
 from typing import Dict, List
 
-# Initialize vector DB at startup
-VECTOR_DB = initialize_vector_db()
+# Vector DB loads in the background once the navigator starts
+VECTOR_DB = VectorDBLoader(load_shared_vector_db)
 
 class Action(Enum):
     GOTO = "goto"
@@ -17,8 +18,7 @@ class Action(Enum):
 
 def get_llm_plan(user_goal: str) -> Dict:
     """Get action plan from vector database examples"""
-    similar_examples = VECTOR_DB.get_similar_examples(user_goal)
-    return similar_examples[0]["plan"] if similar_examples else {"steps": []}
+    return VECTOR_DB.get().get_plan(user_goal)
 
 def wait_for_angular(page, timeout: int = 30000):
     """Wait for Angular to be stable"""
@@ -93,6 +93,8 @@ def perform_click(page, element_description: str) -> bool:
         return False
 
 def interactive_angular_navigator():
+    # Load the encoder while the browser launches
+    VECTOR_DB.start()
     with sync_playwright() as p:
         # Launch with realistic browser context
         browser = p.chromium.launch(headless=False, args=[
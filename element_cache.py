@@ -0,0 +1,240 @@
+"""
+Element lookup caches for perform_action_on_element.
+
+Entries are keyed by URL pattern and element description. The URL pattern
+drops the query string and fragment (except hash routes like #/dashboard) and
+replaces id-like path segments with {id}, so a selector learned on one
+course's page is reused on every course:
+
+    https://learn.uq.edu.au/ultra/courses/_123456_1/outline?x=1
+    -> learn.uq.edu.au/ultra/courses/{id}/outline
+
+The cache is a SQLite database in WAL mode. Entries expire ELEMENT_CACHE_TTL
+seconds after they were stored, and the least recently used are evicted
+beyond ELEMENT_CACHE_MAX_ENTRIES. Callers re-validate a selector before
+using it and invalidate the entry when it fails.
+
+NegativeCache remembers descriptions that were not found on a page, keyed by
+URL pattern and description together with a fingerprint of the page's DOM,
+for NEGATIVE_CACHE_TTL seconds. The page is only fingerprinted when there is
+such an entry to compare against. It lives in memory only.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+ELEMENT_CACHE_PATH = os.environ.get(
+    "UQ_AGENT_ELEMENT_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "element_cache.sqlite3")
+)
+# Selectors are checked on every hit, so they can live longer than a session
+ELEMENT_CACHE_TTL = 7 * 24 * 3600
+ELEMENT_CACHE_MAX_ENTRIES = 5000
+# Long enough to cover a retried prompt, short enough that a slow page gets
+# another full search soon even if its fingerprint has not changed
+NEGATIVE_CACHE_TTL = 60
+NEGATIVE_CACHE_MAX_ENTRIES = 500
+
+# Path segments that identify one record rather than a page type: numbers,
+# Blackboard ids like _123456_1, UUIDs/hashes and other long tokens with digits
+ID_SEGMENT = re.compile(
+    r"^(\d+|_\d+_\d+|[0-9a-f]{8}(-?[0-9a-f]{4}){3}-?[0-9a-f]{12}|[0-9a-f]{16,}|(?=[^/]*\d)[\w-]{12,})$",
+    re.IGNORECASE
+)
+
+
+def url_pattern(url: str) -> str:
+    """Host and path of a URL with id-like path segments replaced by {id}"""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/")
+    # Single-page apps route on the fragment
+    if parsed.fragment.startswith("/"):
+        path += "#" + parsed.fragment.split("?")[0].rstrip("/")
+    segments = ["{id}" if ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return parsed.netloc.lower() + "/".join(segments)
+
+
+def normalize_description(element_description: str) -> str:
+    return " ".join(element_description.lower().split())
+
+
+class ElementCache:
+    """SQLite-backed (URL pattern, description) -> selector cache with LRU+TTL eviction"""
+
+    def __init__(self, path: str = ELEMENT_CACHE_PATH, ttl: float = ELEMENT_CACHE_TTL,
+                 max_entries: int = ELEMENT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Expired on lookup or invalidated after the selector failed
+        self.stale = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS selectors (
+                url_pattern TEXT NOT NULL,
+                description TEXT NOT NULL,
+                selector TEXT NOT NULL,
+                element_info TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (url_pattern, description)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS selectors_last_used ON selectors (last_used)")
+
+    def get(self, url: str, element_description: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """(selector, element_info) for a fresh entry, else (None, None)"""
+        key = (url_pattern(url), normalize_description(element_description))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT selector, element_info, created FROM selectors WHERE url_pattern = ? AND description = ?",
+                key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None, None
+            selector, element_info, created = row
+            if now - created >= self.ttl:
+                self._conn.execute("DELETE FROM selectors WHERE url_pattern = ? AND description = ?", key)
+                self.stale += 1
+                self.misses += 1
+                return None, None
+            self._conn.execute(
+                "UPDATE selectors SET last_used = ? WHERE url_pattern = ? AND description = ?",
+                (now, *key)
+            )
+            self.hits += 1
+            return selector, json.loads(element_info)
+
+    def put(self, url: str, element_description: str, selector: str, element_info: Dict):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO selectors VALUES (?, ?, ?, ?, ?, ?)",
+                (url_pattern(url), normalize_description(element_description), selector,
+                 json.dumps(element_info), now, now)
+            )
+            evicted = self._conn.execute(
+                "DELETE FROM selectors WHERE rowid IN "
+                "(SELECT rowid FROM selectors ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            self.evictions += evicted
+
+    def invalidate(self, url: str, element_description: str):
+        """Drop an entry whose selector no longer finds the element"""
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM selectors WHERE url_pattern = ? AND description = ?",
+                (url_pattern(url), normalize_description(element_description))
+            ).rowcount
+            self.stale += deleted
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM selectors")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM selectors").fetchone()[0]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class NegativeCache:
+    """In-memory record of lookups that found nothing, with the DOM fingerprint of the page at the time"""
+
+    def __init__(self, ttl: float = NEGATIVE_CACHE_TTL, max_entries: int = NEGATIVE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Entries dropped because the page's fingerprint changed
+        self.changed = 0
+        self.evictions = 0
+        # (URL pattern, description) -> (fingerprint, expiry), least recently added first
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str, element_description: str) -> Tuple[str, str]:
+        return url_pattern(url), normalize_description(element_description)
+
+    def contains(self, url: str, element_description: str,
+                 get_fingerprint: Callable[[], Optional[str]]) -> bool:
+        """
+        True if this description was missing last time and the page hasn't changed since.
+
+        get_fingerprint is only called when there is an entry to compare it with,
+        so lookups that never failed don't pay for fingerprinting the page.
+        """
+        key = self._key(url, element_description)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False
+
+        fingerprint = get_fingerprint()
+        with self._lock:
+            if fingerprint is not None and fingerprint == entry[0]:
+                self.hits += 1
+                return True
+            self._entries.pop(key, None)
+            self.changed += 1
+            self.misses += 1
+            return False
+
+    def add(self, url: str, element_description: str, fingerprint: str):
+        key = self._key(url, element_description)
+        with self._lock:
+            self._entries[key] = (fingerprint, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "changed": self.changed,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,121 @@
+"""
+Batch fuzzy scoring of element texts against an element description.
+
+Scores are the maximum of ratio, partial_ratio and token_sort_ratio, as in the
+original per-element loop: ratio and partial_ratio on lowercased text,
+token_sort_ratio on fully processed text (lowercased, punctuation stripped).
+Candidate texts are preprocessed once and all candidates are scored with
+rapidfuzz's process.cdist instead of one Python call per pair and scorer.
+
+SemanticMatcher additionally ranks candidates by the cosine similarity of
+their sentence embeddings, for descriptions that share meaning but few
+characters with the element text.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process, utils
+
+MATCH_THRESHOLD = 70
+# Thread start-up costs more than it saves on short candidate lists
+PARALLEL_MIN_CANDIDATES = 2000
+# Share of the combined score (0-100) that comes from cosine similarity
+SEMANTIC_WEIGHT = 0.5
+SEMANTIC_THRESHOLD = 60
+# Element texts past this length add encoding time but little meaning
+SEMANTIC_MAX_TEXT_LENGTH = 200
+# Pages whose element embeddings are kept
+SEMANTIC_CACHE_PAGES = 16
+
+
+def score_texts(description: str, texts: List[str], workers: Optional[int] = None) -> np.ndarray:
+    """Max-of-three fuzzy score (0-100) of each text against the description"""
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    if workers is None:
+        workers = -1 if len(texts) >= PARALLEL_MIN_CANDIDATES else 1
+
+    query = description.lower()
+    lowered = [text.lower() for text in texts]
+    processed_query = utils.default_process(description)
+    processed = [utils.default_process(text) for text in texts]
+
+    scores = process.cdist([query], lowered, scorer=fuzz.ratio, dtype=np.float32, workers=workers)[0]
+    np.maximum(scores, process.cdist([query], lowered, scorer=fuzz.partial_ratio,
+                                     dtype=np.float32, workers=workers)[0], out=scores)
+    np.maximum(scores, process.cdist([processed_query], processed, scorer=fuzz.token_sort_ratio,
+                                     dtype=np.float32, workers=workers)[0], out=scores)
+    return scores
+
+
+def best_match(description: str, texts: List[str], threshold: float = MATCH_THRESHOLD,
+               workers: Optional[int] = None) -> Tuple[Optional[int], float]:
+    """
+    Index and score of the best-scoring text, or (None, best score) below threshold.
+
+    Ties go to the earliest text, like the strict > comparison in the old loop.
+    """
+    scores = score_texts(description, texts, workers)
+    if not len(scores):
+        return None, 0.0
+    best = int(np.argmax(scores))
+    score = float(scores[best])
+    return (best, score) if score >= threshold else (None, score)
+
+
+class SemanticMatcher:
+    """
+    Ranks element texts by fuzzy score combined with embedding similarity.
+
+    `encoder` is any sentence encoder returning L2-normalized vectors, such as
+    ExampleVectorDB.encoder. Element embeddings are cached per page
+    fingerprint, so repeated lookups on an unchanged page only encode the
+    description.
+    """
+
+    def __init__(self, encoder, weight: float = SEMANTIC_WEIGHT, cache_pages: int = SEMANTIC_CACHE_PAGES):
+        self.encoder = encoder
+        self.weight = weight
+        self.cache_pages = cache_pages
+        # fingerprint -> {text: embedding}, least recently used first
+        self._pages: "OrderedDict[str, Dict[str, np.ndarray]]" = OrderedDict()
+
+    def embed(self, texts: List[str], fingerprint: str) -> np.ndarray:
+        """Embeddings of texts, encoding only those not cached for this page yet"""
+        cached = self._pages.pop(fingerprint, {})
+        self._pages[fingerprint] = cached
+        while len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+
+        missing = [text for text in dict.fromkeys(texts) if text not in cached]
+        if missing:
+            vectors = self.encoder.encode([text[:SEMANTIC_MAX_TEXT_LENGTH] for text in missing])
+            cached.update(zip(missing, np.asarray(vectors, dtype=np.float32)))
+        return np.stack([cached[text] for text in texts])
+
+    def score_texts(self, description: str, texts: List[str], fingerprint: str) -> np.ndarray:
+        """Weighted sum of the fuzzy score and 100 x cosine similarity of each text"""
+        if not texts:
+            return np.zeros(0, dtype=np.float32)
+        query = np.asarray(self.encoder.encode([description]), dtype=np.float32)[0]
+        cosine = self.embed(texts, fingerprint) @ query
+        fuzzy = score_texts(description, texts)
+        return (1 - self.weight) * fuzzy + self.weight * 100 * np.clip(cosine, 0, 1)
+
+    def best_match(self, description: str, texts: List[str], fingerprint: str,
+                   threshold: float = SEMANTIC_THRESHOLD,
+                   fuzzy_threshold: float = MATCH_THRESHOLD) -> Tuple[Optional[int], float]:
+        """
+        Index and combined score of the best text, or (None, best score).
+
+        If no text reaches `threshold`, falls back to the fuzzy best_match so
+        nothing it would have accepted is lost.
+        """
+        scores = self.score_texts(description, texts, fingerprint)
+        if not len(scores):
+            return None, 0.0
+        best = int(np.argmax(scores))
+        if scores[best] >= threshold:
+            return best, float(scores[best])
+        return best_match(description, texts, fuzzy_threshold)
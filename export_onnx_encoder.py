@@ -0,0 +1,81 @@
+"""
+Export all-MiniLM-L6-v2 to ONNX and quantize it to int8 for the "onnx" encoder.
+
+Needs torch, sentence-transformers, onnx and onnxruntime, but only here; the
+server then runs the exported model with onnxruntime and tokenizers alone.
+
+    python export_onnx_encoder.py
+    UQ_AGENT_ENCODER=onnx python3 vectorDBClicksIntegrated.py
+"""
+import json
+import os
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from sentence_transformers import SentenceTransformer
+
+from vector_db import MODEL_NAME, ONNX_MODEL_DIR
+
+
+class TokenEmbeddings(torch.nn.Module):
+    """Wraps the Hugging Face model so the export has one plain tensor output"""
+
+    def __init__(self, transformer):
+        super().__init__()
+        self.transformer = transformer
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.transformer(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids
+        ).last_hidden_state
+
+
+def main():
+    os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+    model = SentenceTransformer(MODEL_NAME, device="cpu")
+    transformer = TokenEmbeddings(model[0].auto_model).eval()
+    tokenizer = model.tokenizer
+
+    float_path = os.path.join(ONNX_MODEL_DIR, "model.onnx")
+    int8_path = os.path.join(ONNX_MODEL_DIR, "model_int8.onnx")
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+            float_path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False
+        )
+
+    # Dynamic quantization: int8 weights, activations quantized on the fly
+    quantize_dynamic(float_path, int8_path, weight_type=QuantType.QInt8)
+    os.remove(float_path)
+
+    tokenizer.save_pretrained(ONNX_MODEL_DIR)
+    with open(os.path.join(ONNX_MODEL_DIR, "encoder_config.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "model": MODEL_NAME,
+            "model_file": "model_int8.onnx",
+            "dim": model.get_sentence_embedding_dimension(),
+            "max_seq_length": model.max_seq_length,
+            "pad_token": tokenizer.pad_token,
+            "pad_token_id": tokenizer.pad_token_id
+        }, f, indent=2)
+
+    size_mb = os.path.getsize(int8_path) / 1e6
+    print(f"Wrote {int8_path} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
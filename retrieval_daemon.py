@@ -0,0 +1,211 @@
+"""
+Local retrieval daemon that owns one warm encoder and example index.
+
+Start it once and every entry point (vectorDBClicksIntegrated.py, ClickTest.py,
+click_test_vector.py) shares it instead of loading its own model:
+
+    python retrieval_daemon.py
+
+Entry points create their loader with `VectorDBLoader(load_shared_vector_db)`,
+which connects to the daemon if it is running and otherwise loads the vector
+DB in-process as before.
+"""
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from vector_db import VectorDBLoader, _timed, initialize_vector_db
+
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = int(os.environ.get("UQ_AGENT_DAEMON_PORT", "3002"))
+DAEMON_URL = f"http://{DAEMON_HOST}:{DAEMON_PORT}"
+# How long a client waits for a daemon that is still warming up
+DAEMON_READY_TIMEOUT = 60
+REQUEST_TIMEOUT = 30
+WARMUP_WAIT_SECONDS = 10
+RETRY_INTERVAL = 0.5
+
+DAEMON_DB = VectorDBLoader()
+# ExampleVectorDB and its caches are not thread-safe
+DB_LOCK = threading.Lock()
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status_code, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            self._send_json(200, {'status': 'ok', 'vector_db': DAEMON_DB.status()})
+        else:
+            self._send_json(404, {'status': 'error', 'message': 'Not found'})
+
+    def do_POST(self):
+        try:
+            db = DAEMON_DB.get(timeout=WARMUP_WAIT_SECONDS)
+        except RuntimeError as e:
+            self._send_json(500, {'status': 'error', 'message': str(e)})
+            return
+        if db is None:
+            self._send_json(503, {'status': 'warming_up', 'message': 'Vector DB is still warming up'})
+            return
+
+        try:
+            content_length = int(self.headers['Content-Length'])
+            data = json.loads(self.rfile.read(content_length).decode('utf-8'))
+            path = urlparse(self.path).path
+
+            with DB_LOCK:
+                if path == '/match':
+                    result = {'match': db.match_plan(data['prompt'])}
+                elif path == '/similar':
+                    result = {'results': db.get_similar_examples_batch(data['queries'], data.get('k', 3))}
+                elif path == '/learn':
+                    result = {'learned': db.learn(data['prompt'], data['plan'])}
+                else:
+                    self._send_json(404, {'status': 'error', 'message': 'Not found'})
+                    return
+
+            self._send_json(200, {'status': 'success', **result})
+        except Exception as e:
+            self._send_json(500, {'status': 'error', 'message': str(e)})
+
+
+def run_daemon():
+    httpd = ThreadingHTTPServer((DAEMON_HOST, DAEMON_PORT), DaemonRequestHandler)
+    DAEMON_DB.start()
+    print(f"Retrieval daemon listening on {DAEMON_URL} (vector DB warming up in the background)")
+    httpd.serve_forever()
+
+
+class DaemonError(RuntimeError):
+    """The daemon was reachable but answered a request with an error"""
+
+
+class RemoteVectorDB:
+    """
+    Client for the retrieval daemon with the lookup API of ExampleVectorDB.
+
+    If the daemon can't be reached, calls fall back to an in-process vector
+    DB, loaded the first time it is needed. Errors the daemon reports raise
+    DaemonError instead, and a daemon that is warming up is waited for.
+    """
+
+    def __init__(self, url: str = DAEMON_URL, timeout: float = REQUEST_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self._fallback = None
+
+    def _request(self, path: str, payload: Optional[Dict] = None) -> Dict:
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data,
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def _post(self, path: str, payload: Dict) -> Optional[Dict]:
+        """Daemon's response, or None if it can't be reached and the caller should fall back"""
+        deadline = time.monotonic() + DAEMON_READY_TIMEOUT
+        while True:
+            try:
+                return self._request(path, payload)
+            # HTTPError is a URLError, but means the daemon is up and answered
+            except urllib.error.HTTPError as e:
+                try:
+                    message = json.loads(e.read().decode('utf-8')).get('message', e.reason)
+                except (OSError, ValueError, AttributeError):
+                    message = e.reason
+                finally:
+                    e.close()
+                if e.code == 503 and time.monotonic() < deadline:
+                    time.sleep(RETRY_INTERVAL)
+                    continue
+                raise DaemonError(f"Retrieval daemon returned {e.code} for {path}: {message}") from e
+            except (urllib.error.URLError, ConnectionError):
+                return None
+
+    def _local(self):
+        if self._fallback is None:
+            print("Retrieval daemon unavailable, loading vector DB in-process")
+            self._fallback = initialize_vector_db()
+        return self._fallback
+
+    def status(self) -> Optional[Dict]:
+        """Daemon's loader status, or None if it is not reachable"""
+        try:
+            return self._request('/health')['vector_db']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def wait_until_ready(self, timeout: float = DAEMON_READY_TIMEOUT) -> bool:
+        """True once the daemon reports ready; False if it is not running or never gets there"""
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.status()
+            if status is None or status['state'] in ('error', 'idle'):
+                return False
+            if status['state'] == 'ready':
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(RETRY_INTERVAL)
+
+    def match_plan(self, prompt: str) -> Dict:
+        if self._fallback is None:
+            response = self._post('/match', {'prompt': prompt})
+            if response is not None:
+                return response['match']
+        return self._local().match_plan(prompt)
+
+    def get_plan(self, prompt: str) -> Dict:
+        return self.match_plan(prompt)["plan"] or {"steps": []}
+
+    def get_similar_examples_batch(self, queries: List[str], k: int = 3) -> List[List[Dict]]:
+        if self._fallback is None:
+            response = self._post('/similar', {'queries': queries, 'k': k})
+            if response is not None:
+                return response['results']
+        return self._local().get_similar_examples_batch(queries, k)
+
+    def get_similar_examples(self, query: str, k: int = 3) -> List[Dict]:
+        return self.get_similar_examples_batch([query], k)[0]
+
+    def learn(self, prompt: str, plan: Dict) -> bool:
+        if self._fallback is None:
+            response = self._post('/learn', {'prompt': prompt, 'plan': plan})
+            if response is not None:
+                return response['learned']
+        return self._local().learn(prompt, plan)
+
+    def cache_stats(self) -> Dict:
+        if self._fallback is not None:
+            return self._local().cache_stats()
+        status = self.status() or {}
+        return {'daemon': status.get('caches', {})}
+
+
+def load_shared_vector_db(timings: Optional[Dict[str, float]] = None):
+    """VectorDBLoader factory: use the daemon if it is running, else load in-process"""
+    timings = {} if timings is None else timings
+    client = RemoteVectorDB()
+    with _timed(timings, "connect_daemon"):
+        ready = client.wait_until_ready()
+    if ready:
+        print(f"Using retrieval daemon at {client.url}")
+        return client
+    return initialize_vector_db(timings)
+
+
+if __name__ == "__main__":
+    run_daemon()
@@ -4,14 +4,17 @@ from typing import List, Dict, Optional, Tuple, Any
 from enum import Enum
 import time
 import json
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process
 import json
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from urllib.parse import parse_qs, urlparse
 
 
-from vector_db import initialize_vector_db
+from element_cache import ElementCache, NegativeCache
+import numpy as np
+
+from element_matching import MATCH_THRESHOLD, SemanticMatcher, best_match, score_texts
+from retrieval_daemon import RemoteVectorDB, load_shared_vector_db
+from vector_db import VectorDBLoader
 
 import os
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -26,12 +29,24 @@ class Action(Enum):
     WAIT = "wait"
 
 
-ELEMENT_CACHE = {}
+# Selectors of elements found before, persisted across restarts
+ELEMENT_CACHE = ElementCache()
+# Descriptions recently not found on an unchanged page
+MISSING_ELEMENTS = NegativeCache()
 CURRENT_PAGE = None
 LAST_ACTION_TIME = 0
 DEBUG = True
+# Add prompts whose plan ran successfully to the example index
+LEARNING_MODE = True
+# Rank elements by embedding similarity as well as fuzzy score, using the
+# vector DB's encoder; only possible when the vector DB runs in-process
+SEMANTIC_MATCHING = False
+SEMANTIC_MATCHER = None
 
-VECTOR_DB = initialize_vector_db()
+# Loaded on a background thread by run_server() so the port binds immediately;
+# uses the retrieval daemon when it is running
+VECTOR_DB = VectorDBLoader(load_shared_vector_db)
+WARMUP_WAIT_SECONDS = 10
 
 
 def debug_print(message: str):
@@ -44,16 +59,51 @@ def get_navigation_plan(user_prompt: str) -> Dict:
     Get navigation plan for a user's prompt by querying similar examples from vector database.
     """
     try:
-        similar_examples = VECTOR_DB.get_similar_examples(user_prompt)
-        if similar_examples:
-            debug_print(f"Found matching plan: {similar_examples[0]['plan']}")
-            return similar_examples[0]["plan"]
+        vector_db = VECTOR_DB.get(timeout=WARMUP_WAIT_SECONDS)
+        if vector_db is None:
+            debug_print("Vector DB is still warming up")
+            return {"steps": []}
+        match = vector_db.match_plan(user_prompt)
+        if match["plan"]:
+            debug_print(f"Found matching plan ({match['source']}, score {match['score']:.2f}): {match['plan']}")
+            return match["plan"]
+        debug_print(f"No confident plan: {match['reason']}")
+        return {"steps": [], "reason": match["reason"]}
     except Exception as e:
         debug_print(f"Error getting navigation plan: {e}")
 
     return {"steps": []}
 
 
+def get_semantic_matcher() -> Optional[SemanticMatcher]:
+    """Element matcher sharing the vector DB's encoder, or None if it can't be used yet"""
+    global SEMANTIC_MATCHER
+    if not SEMANTIC_MATCHING:
+        return None
+    if SEMANTIC_MATCHER is None:
+        try:
+            vector_db = VECTOR_DB.get(timeout=0)
+        except RuntimeError:
+            return None
+        # The daemon's encoder lives in another process
+        if vector_db is None or isinstance(vector_db, RemoteVectorDB):
+            return None
+        SEMANTIC_MATCHER = SemanticMatcher(vector_db.encoder)
+    return SEMANTIC_MATCHER
+
+
+def learn_navigation(user_prompt: str, plan: Dict):
+    """Remember the user's phrasing for a plan that just worked"""
+    if not LEARNING_MODE:
+        return
+    try:
+        vector_db = VECTOR_DB.get(timeout=0)
+        if vector_db is not None and vector_db.learn(user_prompt, plan):
+            debug_print(f"Learned new example: {user_prompt}")
+    except Exception as e:
+        debug_print(f"Error learning example: {e}")
+
+
 def execute_plan(current_page, plan: Dict) -> bool:
     """Execute plan with better tab handling and navigation recovery"""
     if not plan or not plan.get("steps"):
@@ -215,56 +265,64 @@ def wait_for_angular(page, timeout: int = 1000):
             pass
 
 
-def find_text_area_element(page, description: str) -> Optional[Any]:
-    """Improved text area finder with better element selection"""
-    common_editors = [
-        'div[role="textbox"]',
-        'div[contenteditable="true"]',
-        '.ql-editor',
-        '.tox-edit-area',
-        '.cke_contents',
-        '.ProseMirror',
-        '.public-DraftEditor-content',
-        '.w-md-editor-content',
-        'textarea.large-textarea',
-        'textarea[aria-label="Post content"]'
-    ]
-
-    for selector in common_editors:
-        try:
-            elements = page.query_selector_all(selector)
-            for element in elements:
-                try:
-                    box = element.bounding_box()
-                    if box and box['width'] > 100 and box['height'] > 50:  # Reduced minimum size
-                        # Check if element is actually visible
-                        if element.is_visible():
-                            return element
-                except:
-                    continue
-        except:
-            continue
+COMMON_EDITORS = [
+    'div[role="textbox"]',
+    'div[contenteditable="true"]',
+    '.ql-editor',
+    '.tox-edit-area',
+    '.cke_contents',
+    '.ProseMirror',
+    '.public-DraftEditor-content',
+    '.w-md-editor-content',
+    'textarea.large-textarea',
+    'textarea[aria-label="Post content"]'
+]
+
+# First visible editor of at least 100x50 px, in selector order, else the
+# largest visible textarea or contenteditable div
+FIND_TEXT_AREA_JS = """([editors, fallback]) => {
+    const visibleBox = (el) => {
+        const rect = el.getBoundingClientRect();
+        // Same rule as Playwright's isVisible(): a non-empty box and not visibility:hidden
+        if (rect.width === 0 || rect.height === 0 || window.getComputedStyle(el).visibility === 'hidden') {
+            return null;
+        }
+        return rect;
+    };
+    for (const selector of editors) {
+        let elements;
+        try {
+            elements = document.querySelectorAll(selector);
+        } catch (e) {
+            continue;
+        }
+        for (const el of elements) {
+            const rect = visibleBox(el);
+            if (rect && rect.width > 100 && rect.height > 50) {
+                return el;
+            }
+        }
+    }
 
-    try:
-        elements = page.query_selector_all('textarea, div[contenteditable="true"]')
-        largest_area = None
-        max_size = 0
+    let largest = null;
+    let maxSize = 0;
+    for (const el of document.querySelectorAll(fallback)) {
+        const rect = visibleBox(el);
+        if (rect && rect.width * rect.height > maxSize) {
+            maxSize = rect.width * rect.height;
+            largest = el;
+        }
+    }
+    return largest;
+}"""
 
-        for element in elements:
-            try:
-                if not element.is_visible():
-                    continue
-
-                box = element.bounding_box()
-                if box:
-                    size = box['width'] * box['height']
-                    if size > max_size:
-                        max_size = size
-                        largest_area = element
-            except:
-                continue
 
-        return largest_area
+def find_text_area_element(page, description: str) -> Optional[Any]:
+    """Find the editor to type into, reading geometry and visibility of all candidates in one call"""
+    try:
+        handle = page.evaluate_handle(FIND_TEXT_AREA_JS,
+                                      [COMMON_EDITORS, 'textarea, div[contenteditable="true"]'])
+        return handle.as_element()
     except:
         return None
 
@@ -281,43 +339,94 @@ def perform_action_on_element(page, action: Action, element_description: str, va
     # Wait for DOM to be ready before proceeding
     try:
         page.wait_for_load_state("domcontentloaded", timeout=15000)
+    except:
+        print("Warning: Page took too long to load, proceeding anyway")
+
+    # Fail fast on a retry against the same page, before waiting for the network;
+    # the page is only fingerprinted if this description was missing before
+    if MISSING_ELEMENTS.contains(current_url, element_description, lambda: dom_fingerprint(page)):
+        print(f"Could not find element matching: {element_description} (page unchanged since last search)")
+        return False
+
+    try:
         page.wait_for_load_state("networkidle", timeout=15000)
     except:
         print("Warning: Page took too long to load, proceeding anyway")
 
     # Rest of the function remains the same...
-    cached_selector, _ = get_cached_element(current_url, element_description)
+    cached_selector, element_info = get_cached_element(current_url, element_description)
     if cached_selector:
         try:
-            element = page.query_selector(cached_selector)
-            if element:
-                return _execute_action(page, action, element, element_description, value)
+            element = resolve_cached_element(page, cached_selector, element_info)
+            if element and _execute_action(page, action, element, element_description, value):
+                return True
+            debug_print(f"Cached selector failed: {cached_selector}")
         except Exception as e:
             print(f"Cache action failed: {e}")
+        ELEMENT_CACHE.invalidate(current_url, element_description)
 
     # Special handling for text areas
+    found_text_area = False
     if action in (Action.FILL, Action.TYPE) and any(word in element_description.lower()
                                                     for word in
                                                     ['post', 'content', 'reply', 'comment', 'text', 'message']):
         element = find_text_area_element(page, element_description)
+        found_text_area = element is not None
         if element:
             try:
                 return _execute_action(page, action, element, element_description, value)
             except Exception as e:
                 debug_print(f"Action failed on text area: {e}")
 
-    # Try fuzzy matching
-    element = find_element_by_text(page, element_description)
+    # Try fuzzy matching, then the accessibility tree for elements whose
+    # accessible name doesn't come from their text
+    element = find_element_by_text(page, element_description) or \
+        find_element_by_accessibility(page, element_description)
     if element:
         try:
             return _execute_action(page, action, element, element_description, value)
         except Exception as e:
             debug_print(f"Action failed on found element: {e}")
+    elif not found_text_area:
+        # Fingerprint the settled page, which is what a retry will see
+        fingerprint = dom_fingerprint(page)
+        if fingerprint:
+            MISSING_ELEMENTS.add(current_url, element_description, fingerprint)
 
     print(f"Could not find element matching: {element_description}")
     return False
 
 
+# Hash of the page path and the tag, text and labels of every element a lookup
+# strategy can match (FINGERPRINT_SELECTOR); changes whenever one appears,
+# disappears or is renamed
+DOM_FINGERPRINT_JS = """(selector) => {
+    let hash = 2166136261;
+    const add = (s) => {
+        for (let i = 0; i < s.length; i++) {
+            hash = Math.imul(hash ^ s.charCodeAt(i), 16777619);
+        }
+        hash = Math.imul(hash ^ 0, 16777619);
+    };
+    add(location.pathname + location.hash);
+    for (const el of document.querySelectorAll(selector)) {
+        add(el.tagName);
+        add((el.textContent || '').trim().slice(0, 100));
+        add(el.getAttribute('aria-label') || el.getAttribute('placeholder') || '');
+        add(el.getAttribute('title') || el.getAttribute('role') || '');
+    }
+    return (hash >>> 0).toString(16);
+}"""
+
+
+def dom_fingerprint(page) -> Optional[str]:
+    """Fingerprint of the page's interactive elements, or None if the page can't be read"""
+    try:
+        return page.evaluate(DOM_FINGERPRINT_JS, FINGERPRINT_SELECTOR)
+    except Exception:
+        return None
+
+
 def find_course_element_by_description(page, description: str) -> Optional[Any]:
     """Find course element based on description text"""
     # Extract potential course code from description
@@ -330,11 +439,88 @@ def find_course_element_by_description(page, description: str) -> Optional[Any]:
 
 
 def get_cached_element(url: str, element_description: str) -> Optional[Tuple[str, Dict]]:
-    cache_key = get_cache_key(url, element_description)
-    cached = ELEMENT_CACHE.get(cache_key)
-    if cached and time.time() - cached['timestamp'] < 3600:  # Cache valid for 1 hour
-        return cached['selector'], cached['element_info']
-    return None, None
+    return ELEMENT_CACHE.get(url, element_description)
+
+
+# Builds a selector that matches only this element, preferring stable attributes
+# over a structural path; None if nothing unique could be found
+UNIQUE_SELECTOR_JS = r"""(el) => {
+    const isUnique = (selector) => {
+        try {
+            return document.querySelectorAll(selector).length === 1;
+        } catch (e) {
+            return false;
+        }
+    };
+    const quote = (value) => '"' + value.replace(/["\\]/g, '\\$&') + '"';
+    const tag = el.tagName.toLowerCase();
+    const text = (el.innerText || el.getAttribute('aria-label') || el.getAttribute('placeholder') || '')
+        .trim().slice(0, 100);
+    const result = (selector) => ({selector: selector, tag: tag, text: text});
+
+    if (el.id && isUnique('#' + CSS.escape(el.id))) {
+        return result('#' + CSS.escape(el.id));
+    }
+    const attributes = ['data-testid', 'data-test-id', 'data-automation-id', 'data-course-id',
+                        'data-id', 'aria-label', 'name', 'href', 'title'];
+    for (const attr of attributes) {
+        const value = el.getAttribute(attr);
+        if (value) {
+            const selector = `${tag}[${attr}=${quote(value)}]`;
+            if (isUnique(selector)) {
+                return result(selector);
+            }
+        }
+    }
+
+    // Shortest nth-of-type path, anchored at the nearest ancestor with a unique id
+    const parts = [];
+    for (let node = el; node && node !== document.documentElement; node = node.parentElement) {
+        if (node !== el && node.id && isUnique('#' + CSS.escape(node.id))) {
+            parts.unshift('#' + CSS.escape(node.id));
+        } else {
+            let part = node.tagName.toLowerCase();
+            const siblings = node.parentElement ? Array.from(node.parentElement.children)
+                .filter((sibling) => sibling.tagName === node.tagName) : [node];
+            if (siblings.length > 1) {
+                part += `:nth-of-type(${siblings.indexOf(node) + 1})`;
+            }
+            parts.unshift(part);
+        }
+        if (isUnique(parts.join(' > '))) {
+            return result(parts.join(' > '));
+        }
+    }
+    return null;
+}"""
+
+# Returns the element only if the selector still matches exactly one visible
+# element with the text it had when cached
+VALIDATE_SELECTOR_JS = """([selector, text]) => {
+    let matches;
+    try {
+        matches = document.querySelectorAll(selector);
+    } catch (e) {
+        return null;
+    }
+    if (matches.length !== 1) {
+        return null;
+    }
+    const el = matches[0];
+    const rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0 || window.getComputedStyle(el).visibility === 'hidden') {
+        return null;
+    }
+    const current = (el.innerText || el.getAttribute('aria-label') || el.getAttribute('placeholder') || '')
+        .trim().slice(0, 100);
+    return current === text ? el : null;
+}"""
+
+
+def resolve_cached_element(page, selector: str, element_info: Dict) -> Optional[Any]:
+    """Check a cached selector and get its element in one round trip; None if it is stale"""
+    handle = page.evaluate_handle(VALIDATE_SELECTOR_JS, [selector, element_info.get('text', '')])
+    return handle.as_element()
 
 
 def _execute_action(page, action: Action, element, element_description: str, value: str = None) -> bool:
@@ -351,21 +537,8 @@ def _execute_action(page, action: Action, element, element_description: str, val
         page.wait_for_load_state("domcontentloaded", timeout=10000)
         element.wait_for_element_state("stable", timeout=10000)
 
-        tag = element.evaluate("el => el.tagName.toLowerCase()")
-        text = element.inner_text().strip()
-        if not text and tag in ('input', 'textarea', 'div'):
-            text = element.get_attribute('placeholder') or ""
-            label = element.evaluate('''el => {
-                const id = el.id;
-                if (id) {
-                    const label = document.querySelector(`label[for="${id}"]`);
-                    return label ? label.textContent.trim() : '';
-                }
-                return '';
-            }''')
-            if label:
-                text = f"{text} {label}".strip()
-        selector = f"{tag}:has-text('{text}')" if text else f"{tag}"
+        # Built before acting, since a click may navigate away from the element
+        locator = element.evaluate(UNIQUE_SELECTOR_JS)
 
         ensure_element_visible(page, element)
 
@@ -384,12 +557,7 @@ def _execute_action(page, action: Action, element, element_description: str, val
                     except:
                         page.evaluate('(element) => { element.scrollIntoView(); element.click(); }', element)
 
-                cache_element_selector(
-                    current_url,
-                    element_description,
-                    selector,
-                    {"type": "text_match", "text": text, "tag": tag}
-                )
+                cache_element_locator(current_url, element_description, locator, "text_match")
                 LAST_ACTION_TIME = time.time()
                 return True
             except Exception as e:
@@ -398,46 +566,26 @@ def _execute_action(page, action: Action, element, element_description: str, val
 
         elif action == Action.HOVER:
             element.hover(timeout=10000)
-            cache_element_selector(
-                current_url,
-                element_description,
-                selector,
-                {"type": "text_match", "text": text, "tag": tag}
-            )
+            cache_element_locator(current_url, element_description, locator, "text_match")
             LAST_ACTION_TIME = time.time()
             return True
 
         elif action == Action.FILL and value:
             element.fill(value)
-            cache_element_selector(
-                current_url,
-                element_description,
-                selector,
-                {"type": "input_field", "text": text, "tag": tag}
-            )
+            cache_element_locator(current_url, element_description, locator, "input_field")
             LAST_ACTION_TIME = time.time()
             return True
 
         elif action == Action.TYPE and value:
             element.click()
             page.keyboard.type(value, delay=100)  # Slower typing for reliability
-            cache_element_selector(
-                current_url,
-                element_description,
-                selector,
-                {"type": "text_area", "text": text, "tag": tag}
-            )
+            cache_element_locator(current_url, element_description, locator, "text_area")
             LAST_ACTION_TIME = time.time()
             return True
 
         elif action == Action.SELECT and value:
             element.select_option(value)
-            cache_element_selector(
-                current_url,
-                element_description,
-                selector,
-                {"type": "select", "text": text, "tag": tag}
-            )
+            cache_element_locator(current_url, element_description, locator, "select")
             LAST_ACTION_TIME = time.time()
             return True
 
@@ -449,16 +597,18 @@ def _execute_action(page, action: Action, element, element_description: str, val
 
 
 def cache_element_selector(url: str, element_description: str, selector: str, element_info: Dict):
-    cache_key = get_cache_key(url, element_description)
-    ELEMENT_CACHE[cache_key] = {
-        'selector': selector,
-        'element_info': element_info,
-        'timestamp': time.time()
-    }
+    ELEMENT_CACHE.put(url, element_description, selector, element_info)
 
 
-def get_cache_key(url: str, element_description: str) -> str:
-    return f"{url}|||{element_description.lower().strip()}"
+def cache_element_locator(url: str, element_description: str, locator: Optional[Dict], element_type: str):
+    """Cache a locator from UNIQUE_SELECTOR_JS; elements without a unique selector aren't cached"""
+    if locator:
+        cache_element_selector(
+            url,
+            element_description,
+            locator['selector'],
+            {"type": element_type, "text": locator['text'], "tag": locator['tag']}
+        )
 
 
 def ensure_element_visible(page, element):
@@ -486,7 +636,7 @@ def ensure_element_visible(page, element):
 
 
 def find_course_element(page, course_code: str) -> Optional[Any]:
-    """Improved course element finder with multiple strategies"""
+    """Find a course's element in one in-page search; strategies are in the element index's findCourse"""
     if not course_code:
         return None
 
@@ -495,119 +645,464 @@ def find_course_element(page, course_code: str) -> Optional[Any]:
     if len(clean_code) < 5:  # Minimum reasonable course code length
         return None
 
-    # Try different strategies to find the course element
-    selectors = [
-        f'[title*="{clean_code}"]',  # Match title attribute
-        f'[aria-label*="{clean_code}"]',  # Match aria-label
-        f'[data-course-id*="{clean_code}"]',  # Match data attributes
-        f'[id*="{clean_code.lower()}"]',  # Match ID
-        f'[class*="course-{clean_code.lower()}"]',  # Match class
-        f'[href*="{clean_code.lower()}"]',  # Match href
-        f'text=/.*{clean_code}.*/i',  # Text contains course code
-        f'text=/.*{clean_code[:4]}.*{clean_code[4:]}.*/i'  # Text with possible space
-    ]
-
-    for selector in selectors:
-        try:
-            element = page.query_selector(selector)
-            if element and element.is_visible():
-                return element
-        except:
-            continue
-
-    # Fallback: Find by text in course cards or lists
+    # Title, aria-label, data-course-id, id, class and href attributes, then
+    # text with and without a space, then course cards and list items
     try:
-        course_containers = page.query_selector_all(
-            '.course-card, [class*="course-node"], .course-item, .course-list-item')
-        for container in course_containers:
-            if not container.is_visible():
-                continue
-
-            text = container.inner_text().upper().replace(' ', '')
-            if clean_code in text:
-                return container
-
-            # Check child elements
-            children = container.query_selector_all('*')
-            for child in children:
-                try:
-                    child_text = child.inner_text().upper().replace(' ', '')
-                    if clean_code in child_text:
-                        return child
-                except:
-                    continue
+        match = query_element_index(page, 'findCourse', clean_code)
+        if match:
+            debug_print(f"Course {clean_code} found by {match['strategy']}: '{match['text'][:60]}'")
+            return resolve_candidate(page, match)
     except:
         pass
 
     return None
 
 
-def find_element_by_text(page, text: str, threshold: int = 70) -> Optional[Any]:
+INTERACTIVE_SELECTOR = 'a, button, [role=button], [role=link], input, textarea, [role=textbox], [contenteditable=true]'
+COURSE_CONTAINER_SELECTOR = '.course-card, [class*="course-node"], .course-item, .course-list-item'
+
+# Installed once per page (init script for new documents, evaluate for pages
+# already open). Keeps window.__uqAgentIndex: every element matching the
+# selector, tagged with a data-uq-agent-id attribute so a match can be resolved
+# without re-scanning. A MutationObserver adds elements as they are inserted and
+# marks the cached text of changed elements' indexed ancestors stale, so queries
+# only re-read what changed since the last action.
+ELEMENT_INDEX_JS = """(() => {
+    if (window.__uqAgentIndex) {
+        return;
+    }
+    const SELECTOR = __SELECTOR__;
+    const COURSE_SELECTOR = __COURSE_SELECTOR__;
+    const entries = new Map();
+    const byElement = new WeakMap();
+    // Set when elements are inserted or moved, so entries may be out of document order
+    let unordered = false;
+
+    const add = (el) => {
+        if (byElement.has(el)) {
+            return;
+        }
+        let id = el.getAttribute('data-uq-agent-id');
+        // Cloned nodes copy the attribute of the original
+        if (!id || entries.has(id)) {
+            id = String(window.__uqAgentNextId || 1);
+            window.__uqAgentNextId = Number(id) + 1;
+            el.setAttribute('data-uq-agent-id', id);
+        }
+        const entry = {id: id, el: el, text: null};
+        entries.set(id, entry);
+        byElement.set(el, entry);
+    };
+    const addTree = (root) => {
+        if (root.nodeType !== Node.ELEMENT_NODE) {
+            return;
+        }
+        if (root.matches(SELECTOR)) {
+            add(root);
+        }
+        for (const el of root.querySelectorAll(SELECTOR)) {
+            add(el);
+        }
+    };
+    const invalidate = (node) => {
+        for (let el = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement; el; el = el.parentElement) {
+            const entry = byElement.get(el);
+            if (entry) {
+                entry.text = null;
+            }
+        }
+    };
+
+    const documentOrder = (a, b) =>
+        a.el.compareDocumentPosition(b.el) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1;
+
+    // Connected entries matching selector, in document order so ties between
+    // matches go to the first element on the page; removed elements are
+    // dropped here rather than in the observer
+    function* live(selector) {
+        if (unordered) {
+            // Disconnected elements have no document position to sort by
+            const connected = [];
+            for (const entry of entries.values()) {
+                if (entry.el.isConnected) {
+                    connected.push(entry);
+                } else {
+                    byElement.delete(entry.el);
+                }
+            }
+            entries.clear();
+            for (const entry of connected.sort(documentOrder)) {
+                entries.set(entry.id, entry);
+            }
+            unordered = false;
+        }
+        for (const [id, entry] of entries) {
+            if (!entry.el.isConnected) {
+                entries.delete(id);
+                byElement.delete(entry.el);
+            } else if (entry.el.matches(selector)) {
+                yield entry;
+            }
+        }
+    }
+    // Text of the element without script, style, noscript and template
+    // contents, which Playwright's text= engine and innerText leave out too
+    const SKIPPED_TAGS = ['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE'];
+    const elementText = (el) => {
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, {
+            acceptNode: (node) => node.nodeType === Node.ELEMENT_NODE && SKIPPED_TAGS.includes(node.tagName) ?
+                NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT
+        });
+        let text = '';
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            if (node.nodeType === Node.TEXT_NODE) {
+                text += node.data;
+            }
+        }
+        return text.replace(/\\s+/g, ' ').trim();
+    };
+    const textOf = (entry) => {
+        if (entry.text === null) {
+            entry.text = elementText(entry.el);
+        }
+        return entry.text;
+    };
+    // Description of el for resolve_candidate, indexing it first if needed
+    const describe = (el) => {
+        if (!byElement.has(el)) {
+            add(el);
+            unordered = true;
+        }
+        const entry = byElement.get(el);
+        return {id: entry.id, tag: el.tagName.toLowerCase(), text: textOf(entry)};
+    };
+    // Same rule as Playwright's isVisible(): a non-empty box and not visibility:hidden
+    const isVisible = (el, rect) => rect.width > 0 && rect.height > 0 &&
+        window.getComputedStyle(el).visibility !== 'hidden';
+    // Deepest elements, in document order, whose text satisfies test; like
+    // Playwright's text= engine, an element is skipped if a child also matches
+    const normalizedText = (el) => elementText(el).toUpperCase();
+    function* deepestMatches(el, test) {
+        let childMatched = false;
+        for (const child of el.children) {
+            if (!SKIPPED_TAGS.includes(child.tagName) && test(normalizedText(child))) {
+                childMatched = true;
+                yield* deepestMatches(child, test);
+            }
+        }
+        if (!childMatched) {
+            yield el;
+        }
+    }
+
+    const observer = new MutationObserver((records) => {
+        for (const record of records) {
+            if (record.type === 'attributes') {
+                // SELECTOR has no descendant combinators, so only the target
+                // itself can have started matching
+                if (record.target.matches(SELECTOR)) {
+                    add(record.target);
+                }
+            } else {
+                invalidate(record.target);
+                for (const node of record.addedNodes) {
+                    addTree(node);
+                    unordered = true;
+                }
+            }
+        }
+    });
+    if (document.documentElement) {
+        addTree(document.documentElement);
+    }
+    observer.observe(document, {
+        childList: true, subtree: true, characterData: true,
+        attributes: true, attributeFilter: ['class', 'role', 'contenteditable']
+    });
+
+    window.__uqAgentIndex = {
+        // Description of every indexed element matching selector, for text matching in Python
+        candidates(selector) {
+            const candidates = [];
+            for (const entry of live(selector)) {
+                const el = entry.el;
+                const rect = el.getBoundingClientRect();
+                const visible = isVisible(el, rect);
+                const tag = el.tagName.toLowerCase();
+                let label = '';
+                let context = '';
+                if (visible && ['input', 'textarea', 'select'].includes(tag)) {
+                    if (el.id) {
+                        const labelEl = document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+                        label = labelEl ? labelEl.textContent.trim() : '';
+                    }
+                    const container = el.closest('div, li, section, article');
+                    context = container ? container.textContent.trim() : '';
+                }
+                candidates.push({
+                    id: entry.id,
+                    tag: tag,
+                    text: visible ? textOf(entry) : '',
+                    label: label,
+                    placeholder: el.getAttribute('placeholder') || '',
+                    ariaLabel: el.getAttribute('aria-label') || '',
+                    context: context,
+                    visible: visible,
+                    bbox: [rect.x, rect.y, rect.width, rect.height]
+                });
+            }
+            return candidates;
+        },
+        // First visible element matching selector whose text, ignoring case and
+        // whitespace, contains needle (given upper-cased, without whitespace)
+        findText(selector, needle) {
+            for (const entry of live(selector)) {
+                if (textOf(entry).toUpperCase().replace(/ /g, '').includes(needle) &&
+                        isVisible(entry.el, entry.el.getBoundingClientRect())) {
+                    return {id: entry.id, tag: entry.el.tagName.toLowerCase(), text: textOf(entry)};
+                }
+            }
+            return null;
+        },
+        // First visible deepest element whose text contains needle, ignoring
+        // case and whitespace, like Playwright's text=/needle/i; if there is
+        // none, the candidates matching selector for fuzzy matching instead
+        matchText(selector, needle) {
+            const upper = needle.replace(/\\s+/g, ' ').trim().toUpperCase();
+            const test = (text) => text.includes(upper);
+            if (upper && document.body && test(normalizedText(document.body))) {
+                for (const el of deepestMatches(document.body, test)) {
+                    if (isVisible(el, el.getBoundingClientRect())) {
+                        return {exact: describe(el), candidates: []};
+                    }
+                }
+            }
+            return {exact: null, candidates: this.candidates(selector)};
+        },
+        // First visible element for a course code, trying each strategy in
+        // priority order: attributes, then text, then course cards
+        findCourse(code) {
+            const found = (el, strategy) => ({...describe(el), strategy: strategy});
+            const visible = (el) => isVisible(el, el.getBoundingClientRect());
+
+            const quoted = (value) => '"' + CSS.escape(value) + '"';
+            const lower = code.toLowerCase();
+            const attributeSelectors = [
+                `[title*=${quoted(code)}]`,
+                `[aria-label*=${quoted(code)}]`,
+                `[data-course-id*=${quoted(code)}]`,
+                `[id*=${quoted(lower)}]`,
+                `[class*=${quoted('course-' + lower)}]`,
+                `[href*=${quoted(lower)}]`
+            ];
+            for (const selector of attributeSelectors) {
+                const el = Array.from(document.querySelectorAll(selector)).find(visible);
+                if (el) {
+                    return found(el, selector);
+                }
+            }
+
+            // The code as written, then with anything (e.g. a space) between its
+            // letters and digits
+            const prefix = code.slice(0, 4);
+            const rest = code.slice(4);
+            const textTests = [
+                ['text', (text) => text.includes(code)],
+                ['spaced text', (text) => {
+                    const start = text.indexOf(prefix);
+                    return start >= 0 && text.indexOf(rest, start + prefix.length) >= 0;
+                }]
+            ];
+            if (document.body) {
+                for (const [strategy, test] of textTests) {
+                    if (!test(normalizedText(document.body))) {
+                        continue;
+                    }
+                    for (const el of deepestMatches(document.body, test)) {
+                        if (visible(el)) {
+                            return found(el, strategy);
+                        }
+                    }
+                }
+            }
+
+            const container = this.findText(COURSE_SELECTOR, code);
+            return container ? {...container, strategy: 'course container'} : null;
+        }
+    };
+})()""".replace('__SELECTOR__', json.dumps(INTERACTIVE_SELECTOR + ', ' + COURSE_CONTAINER_SELECTOR)) \
+    .replace('__COURSE_SELECTOR__', json.dumps(COURSE_CONTAINER_SELECTOR))
+
+# Installs the index if the page doesn't have it yet, then calls one of its methods
+QUERY_ELEMENT_INDEX_JS = "([method, args]) => {\n    " + ELEMENT_INDEX_JS + ";\n    return window.__uqAgentIndex[method](...args);\n}"
+
+
+def install_element_index(context):
+    """Keep an element index on every page of the context, including pages already open"""
+    context.add_init_script(script=ELEMENT_INDEX_JS)
+    for page in context.pages:
+        try:
+            page.evaluate(ELEMENT_INDEX_JS)
+        except Exception as e:
+            debug_print(f"Could not install element index on {page.url}: {e}")
+
+
+def query_element_index(page, method: str, *args) -> Any:
+    """Call a method of the page's element index in a single round trip"""
+    return page.evaluate(QUERY_ELEMENT_INDEX_JS, [method, list(args)])
+
+
+def snapshot_candidates(page, selector: str = INTERACTIVE_SELECTOR) -> List[Dict]:
+    """Describe all elements matching selector in a single round trip"""
+    return query_element_index(page, 'candidates', selector)
+
+
+def candidate_text(candidate: Dict) -> str:
+    """Text to match a description against, falling back to labels for empty form fields"""
+    if candidate['text']:
+        return candidate['text']
+    if candidate['tag'] in ('input', 'textarea', 'select'):
+        combined = f"{candidate['label']} {candidate['placeholder']} {candidate['context']}".strip()
+        if combined:
+            return combined
+    return candidate['ariaLabel']
+
+
+def resolve_candidate(page, candidate: Dict) -> Optional[Any]:
+    return page.query_selector(f'[data-uq-agent-id="{candidate["id"]}"]')
+
+
+def find_element_by_text(page, text: str, threshold: int = MATCH_THRESHOLD) -> Optional[Any]:
     """Improved fuzzy text matching with better element selection"""
-    # First try exact matches
+    # An exact match, or else a snapshot of all interactive elements for
+    # partial matching, in a single round trip
     try:
-        exact_elements = page.query_selector_all(f'text=/{re.escape(text)}/i')
-        for element in exact_elements:
-            if element.is_visible():
-                return element
+        result = query_element_index(page, 'matchText', INTERACTIVE_SELECTOR, text)
     except:
-        pass
-
-    # Then try partial matches
+        return None
+    if result['exact']:
+        try:
+            return resolve_candidate(page, result['exact'])
+        except:
+            return None
+    candidates = result['candidates']
+
+    scored = []
+    for candidate in candidates:
+        if candidate['visible']:
+            element_text = candidate_text(candidate)
+            if element_text:
+                scored.append((candidate, element_text))
+
+    # Max of ratio, partial_ratio and token_sort_ratio, scored for all candidates at once,
+    # combined with embedding similarity when semantic matching is on
+    texts = [element_text for _, element_text in scored]
+    matcher = get_semantic_matcher()
+    if matcher:
+        try:
+            index, score = matcher.best_match(text, texts, dom_fingerprint(page) or page.url,
+                                              fuzzy_threshold=threshold)
+        except Exception as e:
+            debug_print(f"Semantic matching failed, using fuzzy scores: {e}")
+            index, score = best_match(text, texts, threshold)
+    else:
+        index, score = best_match(text, texts, threshold)
+    if index is None:
+        return None
+    debug_print(f"Fuzzy match for '{text}': '{scored[index][1][:60]}' ({score:.0f})")
+    # Only the winner is turned into an element handle
     try:
-        partial_elements = page.query_selector_all(
-            'a, button, [role=button], [role=link], input, textarea, [role=textbox], [contenteditable=true]'
-        )
+        return resolve_candidate(page, scored[index][0])
     except:
         return None
 
-    best_match = None
-    highest_score = 0
 
-    for element in partial_elements:
-        try:
-            if not element.is_visible():
-                continue
-
-            element_text = element.inner_text().strip()
-            if not element_text:
-                # Handle input elements with labels
-                if element.evaluate('el => el.tagName.toLowerCase()') in ('input', 'textarea', 'select'):
-                    label_text = element.evaluate('''el => {
-                        const id = el.id;
-                        if (id) {
-                            const label = document.querySelector(`label[for="${id}"]`);
-                            return label ? label.textContent.trim() : '';
-                        }
-                        return '';
-                    }''')
-                    placeholder = element.get_attribute('placeholder') or ""
-                    nearby_text = element.evaluate('''el => {
-                        const container = el.closest('div, li, section, article');
-                        return container ? container.textContent.trim() : '';
-                    }''')
-                    combined_text = f"{label_text} {placeholder} {nearby_text}".strip()
-                    if combined_text:
-                        element_text = combined_text
-
-            if not element_text:
-                continue
-
-            # Calculate multiple similarity scores
-            ratio_score = fuzz.ratio(element_text.lower(), text.lower())
-            partial_score = fuzz.partial_ratio(element_text.lower(), text.lower())
-            token_score = fuzz.token_sort_ratio(element_text.lower(), text.lower())
-
-            # Use the highest score
-            current_score = max(ratio_score, partial_score, token_score)
-
-            if current_score > highest_score and current_score >= threshold:
-                highest_score = current_score
-                best_match = element
-        except:
-            continue
+# Accessibility roles of elements an action can target
+AX_ROLES = {
+    'button', 'link', 'menuitem', 'menuitemcheckbox', 'menuitemradio', 'tab', 'treeitem', 'option',
+    'checkbox', 'radio', 'switch', 'textbox', 'searchbox', 'combobox', 'listbox', 'slider', 'spinbutton'
+}
+# Runner-up matches to try when the best one is hidden
+AX_MAX_TRIES = 5
+# Elements either the text or the accessibility strategy can match, including
+# ARIA widgets and native selects outside INTERACTIVE_SELECTOR
+FINGERPRINT_SELECTOR = ', '.join(
+    [INTERACTIVE_SELECTOR, 'select, option'] +
+    [f'[role={role}]' for role in sorted(AX_ROLES) if f'[role={role}]' not in INTERACTIVE_SELECTOR]
+)
+
+# Called on a resolved DOM node; tags it like the element index does, or
+# returns null if it isn't a visible element
+TAG_AX_NODE_JS = """function () {
+    if (this.nodeType !== Node.ELEMENT_NODE) {
+        return null;
+    }
+    const rect = this.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0 || window.getComputedStyle(this).visibility === 'hidden') {
+        return null;
+    }
+    let id = this.getAttribute('data-uq-agent-id');
+    if (!id) {
+        id = String(window.__uqAgentNextId || 1);
+        window.__uqAgentNextId = Number(id) + 1;
+        this.setAttribute('data-uq-agent-id', id);
+    }
+    return id;
+}"""
+
+
+def find_element_by_accessibility(page, description: str, threshold: int = MATCH_THRESHOLD) -> Optional[Any]:
+    """
+    Match a description against the role and accessible name of every actionable
+    node in one CDP accessibility-tree snapshot.
+
+    Catches elements named by aria-labelledby, title or alt text, and widgets with
+    ARIA roles that the text heuristics don't look at.
+    """
+    try:
+        cdp = page.context.new_cdp_session(page)
+    except Exception as e:
+        debug_print(f"Accessibility tree unavailable: {e}")
+        return None
 
-    return best_match if highest_score >= threshold else None
+    try:
+        candidates = []
+        for node in cdp.send("Accessibility.getFullAXTree")["nodes"]:
+            role = node.get('role', {}).get('value', '')
+            name = (node.get('name', {}).get('value') or '').strip()
+            if not node.get('ignored') and role in AX_ROLES and name and 'backendDOMNodeId' in node:
+                candidates.append((node['backendDOMNodeId'], role, name))
+        if not candidates:
+            return None
+
+        # Score the name alone and with its role, so "Post button" matches a button named "Post"
+        scores = np.maximum(score_texts(description, [name for _, _, name in candidates]),
+                            score_texts(description, [f"{name} {role}" for _, role, name in candidates]))
+        for index in np.argsort(-scores, kind='stable')[:AX_MAX_TRIES]:
+            if scores[index] < threshold:
+                break
+            backend_node_id, role, name = candidates[index]
+            remote = cdp.send("DOM.resolveNode", {"backendNodeId": backend_node_id})["object"]
+            try:
+                result = cdp.send("Runtime.callFunctionOn", {
+                    "objectId": remote["objectId"],
+                    "functionDeclaration": TAG_AX_NODE_JS,
+                    "returnByValue": True
+                })["result"]
+            finally:
+                cdp.send("Runtime.releaseObject", {"objectId": remote["objectId"]})
+            if result.get('value'):
+                debug_print(f"Accessibility match for '{description}': {role} '{name[:60]}' ({scores[index]:.0f})")
+                return resolve_candidate(page, {'id': result['value']})
+        return None
+    except Exception as e:
+        debug_print(f"Accessibility lookup failed: {e}")
+        return None
+    finally:
+        try:
+            cdp.detach()
+        except Exception:
+            pass
 
 
 def get_active_page(context):
@@ -642,11 +1137,12 @@ def get_active_page(context):
     return CURRENT_PAGE
 
 
-def interactive_angular_navigator(prompt):
+def interactive_angular_navigator(prompt, navigation_plan: Optional[Dict] = None):
     with sync_playwright() as p:
         try:
             browser = p.chromium.connect_over_cdp("http://127.0.0.1:9222")
             context = browser.contexts[0] if browser.contexts else browser.new_context()
+            install_element_index(context)
             global CURRENT_PAGE, LAST_ACTION_TIME
 
             # Initialize with first page or new page
@@ -687,8 +1183,8 @@ def interactive_angular_navigator(prompt):
 
                     print(f"\nCurrent active tab: {current_page.url}")
 
-                    # Get the plan from vector DB
-                    plan = get_navigation_plan(user_prompt)
+                    # Get the plan from vector DB, unless the caller already resolved it
+                    plan = navigation_plan if navigation_plan is not None else get_navigation_plan(user_prompt)
                     print(f"\nExecuting plan:\n{json.dumps(plan, indent=2)}")
 
                     # Execute the plan
@@ -696,6 +1192,7 @@ def interactive_angular_navigator(prompt):
 
                     if success:
                         print("Plan executed successfully!")
+                        learn_navigation(user_prompt, plan)
                     else:
                         print("Plan execution failed. Trying to recover...")
                         # Get current page again in case of failure
@@ -732,7 +1229,34 @@ class RequestHandler(BaseHTTPRequestHandler):
         self._set_cors_headers()
         self.end_headers()
     
+    def _send_json(self, status_code, payload):
+        self.send_response(status_code)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode('utf-8'))
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            self._send_json(200, {
+                'status': 'ok',
+                'vector_db': VECTOR_DB.status(),
+                'element_cache': ELEMENT_CACHE.stats(),
+                'missing_elements': MISSING_ELEMENTS.stats()
+            })
+        else:
+            self._send_json(404, {'status': 'error', 'message': 'Not found'})
+
     def do_POST(self):
+        # Give a request that arrives during startup a short grace period
+        # before telling the extension to retry
+        if not VECTOR_DB.ready.wait(WARMUP_WAIT_SECONDS):
+            self._send_json(503, {
+                'status': 'warming_up',
+                'message': "I'm still warming up, please try again in a few seconds."
+            })
+            return
+
         try:
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
@@ -779,8 +1303,17 @@ class RequestHandler(BaseHTTPRequestHandler):
                     }
                 ]
             }
-            interactive_angular_navigator(prompt)
-            success = execute_plan(CURRENT_PAGE, get_navigation_plan(prompt))
+            # Fail fast on a poor match instead of driving the browser through the wrong plan
+            navigation_plan = get_navigation_plan(prompt)
+            if not navigation_plan.get("steps"):
+                reason = navigation_plan.get("reason", "no matching plan")
+                return {
+                    "status": "error",
+                    "message": f"I'm not sure how to do that ({reason}). Could you rephrase it?"
+                }
+
+            interactive_angular_navigator(prompt, navigation_plan)
+            success = execute_plan(CURRENT_PAGE, navigation_plan)
             
             return {
                 "status": "success" if success else "error",
@@ -803,9 +1336,10 @@ class RequestHandler(BaseHTTPRequestHandler):
         return f"I've completed these actions for you:\n- " + "\n- ".join(actions)
 
 def run_server():
-    server_address = ('', 3001)
+    server_address = ('', PORT)
     httpd = HTTPServer(server_address, RequestHandler)
-    print(f"Starting server on port 3001")
+    VECTOR_DB.start()
+    print(f"Starting server on port {PORT} (vector DB warming up in the background)")
     httpd.serve_forever()
 
 if __name__ == "__main__":
@@ -1,2333 +1,1253 @@
 # vector_db.py
-import chromadb
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Set, Tuple
+import numpy as np
+import hashlib
+import itertools
 import json
+import os
+import re
+import threading
+import time
+import uuid
 
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking of the embedding cache
+    fcntl = None
 
-def initialize_vector_db():
-    client = chromadb.PersistentClient(path="./chroma_db")
-    # Delete the existing collection if it exists
+COLLECTION_NAME = "navigation_examples"
+CHROMA_PATH = "./chroma_db"
+VECTOR_BACKEND = os.environ.get("UQ_AGENT_VECTOR_BACKEND", "auto")
+# Below this many examples a brute-force matrix product beats an HNSW index
+NUMPY_BACKEND_MAX_EXAMPLES = 5000
+# Entries in the in-memory prompt caches; a size of 0 disables that cache
+QUERY_CACHE_SIZE = 1024
+RESULT_CACHE_SIZE = 256
+# Semantic matches are rejected below this cosine similarity, or when they beat
+# the best example for a different plan by less than the margin
+MIN_SIMILARITY = float(os.environ.get("UQ_AGENT_MIN_SIMILARITY", "0.5"))
+MIN_MARGIN = float(os.environ.get("UQ_AGENT_MIN_MARGIN", "0.02"))
+# Neighbours fetched when looking for the runner-up plan
+MARGIN_CANDIDATES = 5
+# Bump when the stored metadata layout changes so persisted entries are re-synced
+INDEX_VERSION = 2
+
+# Same pattern as NavigatorAgent._detect_course_code in finalAgent.py
+COURSE_CODE_PATTERN = re.compile(r"\b([A-Z]{4}\d{4})\b")
+# Filler words ignored when telling apart plans for the same course code
+STOPWORDS = {
+    "a", "an", "the", "for", "in", "of", "to", "on", "my", "me", "i", "is", "are",
+    "any", "there", "been", "has", "have", "new", "please", "pls", "can", "you",
+    "show", "check", "see", "view", "open", "go", "access", "display", "get", "find",
+    "need", "want", "where", "what", "whats", "s", "course", "if", "it",
+}
+MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_CACHE_DIR = "./embedding_cache"
+# The embedding cache matrix is rewritten once this share of its rows is unused
+COMPACT_FRACTION = 0.5
+# Prompt embeddings are saved to the embedding cache after this many new ones
+PROMPT_SAVE_INTERVAL = 32
+# The example corpus lives in a data file next to this module so it can be
+# replaced without a code change; see iter_examples for the format
+EXAMPLES_PATH = os.environ.get(
+    "UQ_AGENT_EXAMPLES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "navigation_examples.jsonl")
+)
+EXAMPLES_FORMAT = "uq-agent-navigation-examples"
+# Prompts that led to a successful run, in the same format; merged in at load
+LEARNED_EXAMPLES_PATH = os.environ.get(
+    "UQ_AGENT_LEARNED_EXAMPLES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "learned_examples.jsonl")
+)
+# Oldest learned examples are dropped beyond this many
+LEARNED_EXAMPLES_MAX = 1000
+# Version 2 adds plan templates: "{course}" in a query marks where the course
+# is mentioned, and in the plan it is replaced by the course title
+EXAMPLES_VERSION = 2
+# Course code <-> title table used to fill plan templates
+COURSES_PATH = os.environ.get(
+    "UQ_AGENT_COURSES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "courses.jsonl")
+)
+COURSES_FORMAT = "uq-agent-courses"
+COURSES_VERSION = 1
+COURSE_SLOT = "{course}"
+SLOT_PATTERN = re.compile(r"\{(\w+)\}")
+# Examples are embedded and upserted in chunks of this size while streaming
+SYNC_BATCH_SIZE = 256
+# "torch" runs the sentence-transformers model; "onnx" runs the int8 export
+# written by export_onnx_encoder.py through onnxruntime, without torch
+ENCODER_BACKEND = os.environ.get("UQ_AGENT_ENCODER", "torch")
+ONNX_MODEL_DIR = "./onnx_encoder"
+# Embeddings from different encoders are cached and indexed separately
+ENCODER_NAMES = {
+    "torch": MODEL_NAME,
+    "onnx": f"{MODEL_NAME}-onnx-int8",
+}
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], phase: str):
+    start = time.perf_counter()
     try:
-        client.delete_collection("navigation_examples")
-    except:
-        pass  # Collection didn't exist
-    collection = client.get_or_create_collection(
-        name="navigation_examples",
-        metadata={"hnsw:space": "cosine"}
-    )
+        yield
+    finally:
+        timings[phase] = time.perf_counter() - start
+
+
+def initialize_vector_db(timings: Optional[Dict[str, float]] = None, backend: Optional[str] = None,
+                         encoder: Optional[str] = None):
+    """
+    Load the encoder and index, recording per-phase durations in `timings`.
+
+    `backend` is "numpy", "chroma" or "auto" (default: $UQ_AGENT_VECTOR_BACKEND);
+    "auto" keeps small corpora in memory and uses Chroma for large ones.
+    `encoder` is "torch" or "onnx" (default: $UQ_AGENT_ENCODER).
+    """
+    timings = {} if timings is None else timings
+    backend = backend or VECTOR_BACKEND
+    encoder = encoder or ENCODER_BACKEND
+    if backend == "auto":
+        backend = "numpy" if count_examples() <= NUMPY_BACKEND_MAX_EXAMPLES else "chroma"
+
+    encoder_model = load_encoder(encoder, timings)
+
+    with _timed(timings, "open_index"):
+        collection_name = COLLECTION_NAME if encoder == "torch" else f"{COLLECTION_NAME}_{encoder}"
+        index = create_backend(backend, collection_name=collection_name)
 
     # Initialize the vector DB with examples
-    db = ExampleVectorDB(collection)
-    db.add_examples(get_examples())
+    db = ExampleVectorDB(index, encoder_model, encoder_name=ENCODER_NAMES[encoder])
+    with _timed(timings, "sync_examples"):
+        db.load_examples()
+
+    # The first forward pass is much slower than the rest, so pay for it here
+    with _timed(timings, "warmup"):
+        db.encoder.encode(["warm up"])
     return db
 
 
-class ExampleVectorDB:
+def load_encoder(name: str, timings: Optional[Dict[str, float]] = None):
+    """Load the "torch" or "onnx" encoder, timing the import and load phases"""
+    timings = {} if timings is None else timings
+
+    # Runtimes are imported here rather than at module level so that
+    # importing this module stays cheap
+    if name == "torch":
+        with _timed(timings, "import"):
+            from sentence_transformers import SentenceTransformer
+        with _timed(timings, "load_encoder"):
+            return SentenceTransformer(MODEL_NAME)
+    if name == "onnx":
+        with _timed(timings, "import"):
+            import onnxruntime
+            import tokenizers
+        with _timed(timings, "load_encoder"):
+            return OnnxEncoder(ONNX_MODEL_DIR)
+    raise ValueError(f"Unknown encoder: {name}")
+
+
+def create_backend(name: str, path: str = CHROMA_PATH, collection_name: str = COLLECTION_NAME):
+    """Create a retrieval backend by name"""
+    if name == "numpy":
+        return NumpyBackend()
+    if name == "chroma":
+        import chromadb
+        client = chromadb.PersistentClient(path=path)
+        # Reuse the persisted collection; sync_examples only embeds what changed
+        collection = client.get_or_create_collection(
+            name=collection_name,
+            metadata={"hnsw:space": "cosine"}
+        )
+        return ChromaBackend(collection)
+    raise ValueError(f"Unknown vector backend: {name}")
+
+
+class VectorDBLoader:
+    """
+    Builds the vector DB on a background thread.
+
+    Callers can start serving immediately and either block on `get()` or
+    check `is_ready()` and report that the service is still warming up.
+    """
+
+    def __init__(self, factory=initialize_vector_db):
+        self.factory = factory
+        self.ready = threading.Event()
+        self.timings: Dict[str, float] = {}
+        self.db = None
+        self.error = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> "VectorDBLoader":
+        """Start loading in the background; calling it again is a no-op"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name="vector-db-warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            self.db = self.factory(timings=self.timings)
+            self.timings["total"] = time.perf_counter() - start
+            phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.timings.items()
+                               if phase != "total")
+            print(f"Vector DB ready in {self.timings['total']:.2f}s ({phases})")
+        except Exception as e:
+            self.error = e
+            print(f"Vector DB failed to load: {e}")
+        finally:
+            self.ready.set()
+
+    def is_ready(self) -> bool:
+        return self.ready.is_set() and self.error is None
+
+    def get(self, timeout: Optional[float] = None):
+        """Return the loaded DB, or None if it is not ready within `timeout` seconds"""
+        self.start()
+        if not self.ready.wait(timeout):
+            return None
+        if self.error is not None:
+            raise RuntimeError(f"Vector DB failed to load: {self.error}")
+        return self.db
+
+    def status(self) -> Dict:
+        if not self.ready.is_set():
+            state = "warming_up" if self._thread is not None else "idle"
+        else:
+            state = "ready" if self.error is None else "error"
+        status = {"state": state, "timings": dict(self.timings)}
+        if state == "ready":
+            status["caches"] = self.db.cache_stats()
+        return status
+
+
+def example_hash(example: Dict) -> str:
+    """Content hash of an example's query and plan, used as its id in the index"""
+    payload = json.dumps(
+        {"version": INDEX_VERSION, "query": example["query"], "plan": example["plan"]},
+        sort_keys=True
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def plan_hash(plan: Dict) -> str:
+    """Id of a plan in the plan table; identical plans share one id"""
+    return hashlib.sha1(json.dumps(plan, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss counters"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def items(self) -> List[Tuple]:
+        """(key, value) pairs, least recently used first"""
+        with self._lock:
+            return list(self._data.items())
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class EmbeddingCache:
+    """
+    Persistent text -> embedding cache for example texts and recent prompts.
+
+    Vectors are appended to a float32 matrix that is memory-mapped for reads,
+    and a JSON index maps the hash of each example text, and each saved
+    prompt, to its row. Index writes are batched until flush(). Every read
+    and write holds a lock file, so the retrieval daemon and an in-process
+    fallback can share one cache directory. Once rows no longer in use make
+    up COMPACT_FRACTION of the matrix, flush() rewrites it under a new
+    generation, which tells other processes to reload the index.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, dim: int):
+        self.dir = os.path.join(cache_dir, model_name.replace("/", "_"))
+        self.index_path = os.path.join(self.dir, "index.json")
+        self.lock_path = os.path.join(self.dir, ".lock")
+        self.model_name = model_name
+        self.dim = dim
+        self.generation = None
+        self.matrix_path = None
+        self.rows: Dict[str, int] = {}
+        # Normalized prompt -> row, least recently used first
+        self.prompts: Dict[str, int] = {}
+        # Example rows and the prompt set changed since the index was last written
+        self._unsaved = False
+        self._prompts_unsaved = False
+        self._matrix = None
+        os.makedirs(self.dir, exist_ok=True)
+        with self._locked():
+            self._load_index(self._read_index())
+
+    @contextmanager
+    def _locked(self):
+        """Hold the cache directory's lock file, if the platform supports it"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _matrix_path(self, generation: str) -> str:
+        return os.path.join(self.dir, f"embeddings-{generation}.f32")
+
+    def _read_index(self) -> Optional[Dict]:
+        """The index on disk, or None if it is missing, corrupt or for another encoder"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (index.get("model") != self.model_name or index.get("dim") != self.dim
+                or not index.get("generation")):
+            return None
+        row_count = self._row_count(self._matrix_path(index["generation"]))
+        # Rows past the end of the matrix were never written
+        index["rows"] = {key: row for key, row in index["rows"].items() if row < row_count}
+        index["prompts"] = {text: row for text, row in index.get("prompts", {}).items() if row < row_count}
+        return index
+
+    def _load_index(self, index: Optional[Dict]):
+        start_over = index is None
+        if start_over:
+            # Missing, corrupt or built by another encoder
+            index = {"generation": uuid.uuid4().hex, "rows": {}, "prompts": {}}
+            open(self._matrix_path(index["generation"]), "wb").close()
+        self.generation = index["generation"]
+        self.matrix_path = self._matrix_path(self.generation)
+        self.rows = index["rows"]
+        self.prompts = index["prompts"]
+        self._unsaved = self._prompts_unsaved = False
+        self._matrix = None
+        if start_over:
+            self._save_index()
+        # Including matrices a crash left behind mid-compaction
+        self._remove_old_matrices()
+
+    def _refresh(self) -> Dict:
+        """
+        The index on disk, after reloading ours if another process started a
+        new generation; call with the lock held
+        """
+        index = self._read_index()
+        if index is None or index["generation"] != self.generation:
+            self._load_index(index)
+            index = {"rows": dict(self.rows), "prompts": dict(self.prompts)}
+        return index
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model_name, "dim": self.dim, "generation": self.generation,
+                       "rows": self.rows, "prompts": self.prompts}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _remove_old_matrices(self):
+        current = os.path.basename(self.matrix_path)
+        for name in os.listdir(self.dir):
+            if name.startswith("embeddings") and name.endswith(".f32") and name != current:
+                try:
+                    os.remove(os.path.join(self.dir, name))
+                except OSError:
+                    pass
+
+    def flush(self, keep: Optional[Set[str]] = None):
+        """
+        Write new rows and the saved prompts, merged with rows another process added.
+
+        `keep` holds the hashes of the example texts still in use; rows for
+        other texts are dropped once unused rows reach COMPACT_FRACTION.
+        """
+        with self._locked():
+            index = self._refresh()
+            if self._unsaved or self._prompts_unsaved:
+                self.rows = {**index["rows"], **self.rows}
+                if not self._prompts_unsaved:
+                    self.prompts = index["prompts"]
+                self._save_index()
+                self._unsaved = self._prompts_unsaved = False
+            if keep is not None:
+                self._compact(keep)
+
+    def _compact(self, keep: Set[str]):
+        """Rewrite the matrix with only used rows, if enough of it is unused; call with the lock held"""
+        row_count = self._row_count(self.matrix_path)
+        rows = {key: row for key, row in self.rows.items() if key in keep}
+        if row_count == 0 or row_count - len(rows) - len(self.prompts) < row_count * COMPACT_FRACTION:
+            return
+        old_rows = list(rows.values()) + list(self.prompts.values())
+        vectors = np.array(self._get_matrix()[old_rows]) if old_rows else np.empty((0, self.dim), np.float32)
+        self.generation = uuid.uuid4().hex
+        self.matrix_path = self._matrix_path(self.generation)
+        with open(self.matrix_path, "wb") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        self.rows = {key: i for i, key in enumerate(rows)}
+        self.prompts = {text: len(rows) + i for i, text in enumerate(self.prompts)}
+        self._matrix = None
+        # The new index makes the new matrix current, so a crash before this
+        # leaves the old generation intact
+        self._save_index()
+        self._remove_old_matrices()
+
+    def _row_count(self, matrix_path: str) -> int:
+        try:
+            return os.path.getsize(matrix_path) // (self.dim * 4)
+        except OSError:
+            return 0
+
+    def _get_matrix(self) -> np.ndarray:
+        row_count = self._row_count(self.matrix_path)
+        if row_count == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        if self._matrix is None or self._matrix.shape[0] != row_count:
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r",
+                                     shape=(row_count, self.dim))
+        return self._matrix
+
+    def _append(self, vectors: np.ndarray) -> int:
+        """Append vectors after whatever is on disk and return the first new row; call with the lock held"""
+        first_row = self._row_count(self.matrix_path)
+        with open(self.matrix_path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        return first_row
+
+    def encode(self, texts: List[str], encoder) -> np.ndarray:
+        """Return embeddings for `texts`, encoding only those not cached yet"""
+        keys = [text_hash(text) for text in texts]
+        if not keys:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        # Held while encoding, so processes syncing the same examples embed them once
+        with self._locked():
+            self._refresh()
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key not in self.rows:
+                    missing.setdefault(key, text)
+            if missing:
+                first_row = self._append(np.asarray(encoder.encode(list(missing.values())), dtype=np.float32))
+                for offset, key in enumerate(missing):
+                    self.rows[key] = first_row + offset
+                self._unsaved = True
+            return np.array(self._get_matrix()[[self.rows[key] for key in keys]])
+
+    def load_prompts(self) -> List[Tuple[str, np.ndarray]]:
+        """Saved (prompt, embedding) pairs, least recently used first"""
+        with self._locked():
+            self._refresh()
+            if not self.prompts:
+                return []
+            vectors = np.array(self._get_matrix()[list(self.prompts.values())])
+        return list(zip(self.prompts, vectors))
+
+    def save_prompts(self, prompts: List[Tuple[str, np.ndarray]]):
+        """Replace the saved prompts with `prompts`, least recently used first; written by flush()"""
+        if [text for text, _ in prompts] == list(self.prompts):
+            return
+        with self._locked():
+            self._refresh()
+            new = [(text, vector) for text, vector in prompts if text not in self.prompts]
+            rows = {}
+            if new:
+                first_row = self._append(np.stack([vector for _, vector in new]))
+                rows = {text: first_row + offset for offset, (text, _) in enumerate(new)}
+            self.prompts = {text: self.prompts[text] if text in self.prompts else rows[text]
+                            for text, _ in prompts}
+            self._prompts_unsaved = True
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def detect_course_codes(text: str) -> List[str]:
+    return COURSE_CODE_PATTERN.findall(text.upper())
+
+
+class LexicalIndex:
+    """
+    Exact-phrase and course-code lookup tried before semantic search.
+
+    Course lookups are keyed by the course code in a query, or by the
+    {course} slot for templates and for prompts whose course was masked by
+    CourseTable. Only unambiguous hits are returned; anything else is left
+    to the vector index.
+    """
+
+    def __init__(self):
+        self.by_text: Dict[str, Set[str]] = {}
+        self.by_course: Dict[str, Dict[str, Set[str]]] = {}
+
+    @staticmethod
+    def _course_keywords(query: str) -> Optional[Tuple[str, Set[str]]]:
+        """(course code or COURSE_SLOT, remaining keywords) for a query about one course, else None"""
+        if COURSE_SLOT in query:
+            course = COURSE_SLOT
+            normalized = normalize_query(query.replace(COURSE_SLOT, " "))
+        else:
+            codes = set(detect_course_codes(query))
+            if len(codes) != 1:
+                return None
+            course = codes.pop()
+            normalized = normalize_query(query)
+        return course, {word for word in normalized.split() if word != course.lower() and word not in STOPWORDS}
+
+    def clear(self):
+        self.by_text.clear()
+        self.by_course.clear()
+
+    def add(self, examples: List[Dict]):
+        """Index {"query", "plan_id"} entries"""
+        for ex in examples:
+            plan = ex["plan_id"]
+            normalized = normalize_query(ex["query"])
+            self.by_text.setdefault(normalized, set()).add(plan)
+
+            course_keywords = self._course_keywords(ex["query"])
+            if course_keywords is None:
+                continue
+            course, keywords = course_keywords
+            self.by_course.setdefault(course, {}).setdefault(plan, set()).update(keywords)
+
+    def lookup(self, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (plan_id, "exact" | "course_code") on an unambiguous hit, else (None, None)"""
+        normalized = normalize_query(prompt)
+        plans = self.by_text.get(normalized)
+        if plans and len(plans) == 1:
+            return next(iter(plans)), "exact"
+
+        course_keywords = self._course_keywords(prompt)
+        if course_keywords is None:
+            return None, None
+        course, keywords = course_keywords
+        candidates = self.by_course.get(course)
+        if not candidates:
+            return None, None
+
+        # Accept only if exactly one plan for this course covers every
+        # remaining word, so a single shared word can't skip the semantic
+        # thresholds; a bare course code is enough when it has a single plan
+        if keywords:
+            matching = [plan for plan, plan_keywords in candidates.items() if keywords <= plan_keywords]
+        elif len(candidates) == 1:
+            matching = list(candidates)
+        else:
+            matching = [plan for plan, plan_keywords in candidates.items() if not plan_keywords]
+        if len(matching) == 1:
+            return matching[0], "course_code"
+        return None, None
+
+
+def match_confidence(similar_examples: List[Dict]) -> Tuple[float, Optional[float]]:
+    """Top score and its margin over the best example for a different plan, or None if there is none"""
+    best = similar_examples[0]
+    for example in similar_examples[1:]:
+        if example["plan_id"] != best["plan_id"]:
+            return best["score"], best["score"] - example["score"]
+    return best["score"], None
+
+
+def fill_slots(plan_json: str, values: Dict[str, str]) -> Optional[Dict]:
+    """Decode a plan, replacing each {slot}; None if a slot has no value"""
+    slots = SLOT_PATTERN.findall(plan_json)
+    if not slots:
+        return json.loads(plan_json)
+    if any(slot not in values for slot in slots):
+        return None
+    return json.loads(SLOT_PATTERN.sub(lambda m: json.dumps(values[m.group(1)])[1:-1], plan_json))
+
+
+class CourseTable:
+    """
+    Course code <-> title lookup for plan templates.
+
+    Each course is {"code", "title", "aliases"}; code is null for courses
+    only known by name. A prompt's course is found by code first, then by
+    the longest title or alias it mentions.
+    """
+
+    def __init__(self, courses: Optional[List[Dict]] = None):
+        self.by_code: Dict[str, Dict] = {}
+        self.names: List[Tuple[str, Dict]] = []
+        self.patterns: Dict[int, re.Pattern] = {}
+        for course in courses or []:
+            names = [course["title"], *course.get("aliases", [])]
+            if course.get("code"):
+                self.by_code[course["code"].upper()] = course
+                names.append(course["code"])
+            self.names.extend((normalize_query(name), course) for name in names)
+            # Any run of punctuation or spaces between words, so "F&L" matches "f l"
+            alternatives = sorted((r"[^a-z0-9]+".join(normalize_query(name).split()) for name in names),
+                                  key=len, reverse=True)
+            self.patterns[id(course)] = re.compile(
+                r"(?<![a-z0-9])(?:" + "|".join(alternatives) + r")(?![a-z0-9])", re.IGNORECASE)
+        self.names.sort(key=lambda item: len(item[0]), reverse=True)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def find(self, prompt: str) -> Optional[Dict]:
+        codes = detect_course_codes(prompt)
+        if codes:
+            return self.by_code.get(codes[0])
+        padded = f" {normalize_query(prompt)} "
+        for name, course in self.names:
+            if f" {name} " in padded:
+                return course
+        return None
+
+    def mask(self, prompt: str, course: Dict) -> str:
+        """Replace every mention of `course` in the prompt with the {course} slot"""
+        masked = self.patterns[id(course)].sub(COURSE_SLOT, prompt)
+        # "COMP3702 Artificial Intelligence" is one mention, not two
+        return re.sub(r"\{course\}(?:[^a-z0-9{]+\{course\})+", COURSE_SLOT, masked)
+
+    def template_query(self, prompt: str) -> str:
+        """The prompt as it would appear in a template, or unchanged if it names no known course"""
+        course = self.find(prompt)
+        return self.mask(prompt, course) if course else prompt
+
+    def templatize(self, query: str, plan: Dict) -> Optional[Tuple[str, Dict]]:
+        """Turn an example for one course into a template, or None if it isn't course-specific"""
+        course = self.find(query)
+        if course is None:
+            return None
+        title = course["title"].lower()
+        steps = [dict(step, element_description=COURSE_SLOT)
+                 if step.get("element_description", "").lower() == title else step
+                 for step in plan.get("steps", [])]
+        if steps == plan.get("steps"):
+            return None
+        return self.mask(query, course), dict(plan, steps=steps)
+
+    @staticmethod
+    def slot_values(course: Optional[Dict]) -> Dict[str, str]:
+        if course is None:
+            return {}
+        values = {"course": course["title"]}
+        if course.get("code"):
+            values["course_code"] = course["code"]
+        return values
+
+
+class ChromaBackend:
+    """Persistent Chroma collection with an HNSW index, for large corpora"""
+
     def __init__(self, collection):
-        self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
         self.collection = collection
-        self.examples = []
 
-    def add_examples(self, examples: List[Dict]):
-        """Add examples to the vector database"""
-        self.examples = examples.copy()
-
-        texts = [ex["query"] for ex in examples]
-        embeddings = self.encoder.encode(texts).tolist()
-        ids = [str(i) for i in range(len(texts))]
-        metadatas = [{"plan": json.dumps(ex["plan"])} for ex in examples]
+    def ids(self) -> Set[str]:
+        return set(self.collection.get(include=[])["ids"])
 
-        self.collection.add(
-            embeddings=embeddings,
-            documents=texts,
+    def upsert(self, ids: List[str], embeddings: np.ndarray, documents: List[str], metadatas: List[Dict]):
+        self.collection.upsert(
+            embeddings=embeddings.tolist(),
+            documents=documents,
             metadatas=metadatas,
             ids=ids
         )
 
-    def get_similar_examples(self, query: str, k: int = 3) -> List[Dict]:
-        """Retrieve k most similar examples"""
-        query_embedding = self.encoder.encode([query]).tolist()
+    def delete(self, ids: List[str]):
+        self.collection.delete(ids=ids)
 
+    def query(self, embeddings: np.ndarray, k: int) -> List[List[Dict]]:
         results = self.collection.query(
-            query_embeddings=query_embedding,
+            query_embeddings=embeddings.tolist(),
             n_results=k,
-            include=["metadatas", "documents"]
+            include=["metadatas", "documents", "distances"]
         )
 
-        similar_examples = []
-        for i in range(len(results["ids"][0])):
-            similar_examples.append({
-                "query": results["documents"][0][i],
-                "plan": json.loads(results["metadatas"][0][i]["plan"])
-            })
-
-        return similar_examples
-
-    # Initialize with your existing examples
-def get_examples():
-    # Your existing examples
-    return [
-       
-    
-    {
-        "query": "COMP3710 announcements",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Pattern Recognition and Analysis"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "any new posts in pattern recog course?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Pattern Recognition and Analysis"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "updates DECO3801",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Design Comp Studio 3 announcement?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "see R&D methods announcemnt",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "research and development methods update pls",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "check announcements COMP3400",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Functional and Logical Programming"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "F&L programming updates?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Functional and Logical Programming"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "DECO3800 proposal announcement?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Proposal"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Design Comp Studio proposal updates",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Proposal"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "ENGG1300 updates?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Introduction to Electrical Systems"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "any announcemnt for Intro Elec Sys?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Introduction to Electrical Systems"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-        {
-            "query": "check nursing announcements",
-            "plan": {
-                "steps": [
-                    {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                    {"action": "click", "element_description": "Nursing"},
-                    {"action": "click", "element_description": "Announcements"}
-                ]
-            }
-        },
-
-{
-    "query": "Show me updates for Software Engineering",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Software Engineering"},
-            {"action": "click", "element_description": "Announcements"}
-        ]
-    }
-},
-{
-    "query": "Has the lecturer posted anything new in DECO7250?",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Human-Computer Interaction"},
-            {"action": "click", "element_description": "Announcements"}
-        ]
-    }
-},
-{
-    "query": "Check if there are updates for ENGG1000",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Introduction To Professional Engineering"},
-            {"action": "click", "element_description": "Announcements"}
-        ]
-    }
-},
-{
-    "query": "What's new in Introduction to Professional Engineering?",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Professional Engineering"},
-            {"action": "click", "element_description": "Announcements"}
-        ]
-    }
-},
-{
-    "query": "Need to see if there are new posts for STAT1201",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Analysis of Scientific Data"},
-            {"action": "click", "element_description": "Announcements"}
-        ]
-    }
-},
-
-{
-    "query": "Looking for updates in Foundations of Healthcare",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Foundations of Healthcare"},
-            {"action": "click", "element_description": "Announcements"}
-        ]
-    }
-},
-
-{
-    "query": "Check if there are new announcements for WRIT1001",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Writing for International Students"},
-            {"action": "click", "element_description": "Announcements"}
-        ]
-    }
-},
-
-{
-        "query": "check announcements for COMP3702 - Artificial Intelligence",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "AI course updates pls",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Announcements"}  # Intentional typo in element
-            ]
-        }
-    },
-    {
-        "query": "machine learning announcement?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},  # Intentional URL typo
-                {"action": "click", "element_description": "Machine Learning"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "PHYS1171 announcments",  # Misspelling
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Physical Basis of Biological Systems"},  # Intentional typo
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "physics for engineers updates",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Physics"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-
-    {
-        "query": "see DECO7250 announcemnt",  # Typo
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Human-Computer Interaction"},
-                {"action": "click", "element_description": "Anouncements"}  # Typo
-            ]
-        }
-    },
-{
-        "query": "see Research and Methods announcemnt",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research Methods"},
-                {"action": "click", "element_description": "Anouncements"}  # Typo
-            ]
-        }
-    },
-    # Computer Science
-    {
-        "query": "COMP3506 announcements",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Algorithms and Data Structures"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Show me CSSE3200 updates",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Software Engineering Studio: Design, Implement and Test"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-   
-    {
-        "query": "Check COMP3710 announcements",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Pattern Recognition and Analysis"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Any updates for Pattern Recognition course?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Pattern Recognition and Analysis"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "REIT4882 announcements please",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Computing Research Project"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Any new posts for Research and Development Methods?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Computing Research Project"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Check REIT4842 announcements",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods and Practice"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Any updates in Research Methods (REIT4842)?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods and Practice"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "REIT7842 notifications please",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods and Practice"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Has there been any new information posted for REIT7842 Research Methods?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods and Practice"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "REIT4882 latest updates",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Computing Research Project"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Are there new posts for Research Methods in REIT4882?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Computing Research Project"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Check DECO3801 announcements",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Build"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Any updates for Design Computing Studio 3?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Build"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "DECO3800 announcements please",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Proposal"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Has there been any new information posted for Design Computing Studio 3?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Proposal"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
-    },
-    {
-        "query": "Has there been any new information posted for Design Computing Studio 3?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Proposal"},
-                {"action": "click", "element_description": "Announcements"}
-            ]
-        }
+        matches = []
+        for q in range(len(results["ids"])):
+            matches.append([
+                {
+                    "id": results["ids"][q][i],
+                    "document": results["documents"][q][i],
+                    "metadata": results["metadatas"][q][i],
+                    "distance": results["distances"][q][i]
+                }
+                for i in range(len(results["ids"][q]))
+            ])
+        return matches
 
-    },
-     {
-        "query": "View the course outline for COMP2041",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Theory of Computing"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Display the syllabus for Software Engineering",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Software Engineering"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "I need to see the course details for DECO2500",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Human-Computer Interaction"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },{
-    "query": "Show Artificial Intelligence course details",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Course Profile"},
-            {"action": "click", "element_description": "View Profile"}
-        ]
-    }
-    },
-    {
-        "query": "Where can I find the ENGG1000 course profile?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Introduction to Professional Engineering"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Access the outline for Introduction to Engineering",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Introduction to Engineering"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "I want to check the BISM1201 course structure",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Transforming Business with Information Systems"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "I need to access the STAT1201 course profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Analysis of Scientific Data"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Open the COMP2041 course profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Theory of Computing"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "I need to view the Software Engineering course profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Software Engineering"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Where can I find the DECO7250 course profile?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Human-Computer Interaction"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Show me the ENGG1000 course profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Introduction to Professional Engineering"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Display the Introduction to Engineering course profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Introduction to Engineering"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-
-    {
-        "query": "COMP3702 Artificial Intelligence course profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Show AI course profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Show me COMP3710 course profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Pattern Recognition and Analysis"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "View course outline for Pattern Recognition",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Pattern Recognition and Analysis"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Access REIT4882 course profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Computing Research Project"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Show Research and Development Methods course outline",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Computing Research Project"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Open REIT4842 profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods and Practice"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Display Research Methods syllabus for REIT4842",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods and Practice"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Access REIT7842 course outline",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods and Practice"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Show me the Research Methods content for REIT7842",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Research and Development Methods and Practice"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "View REIT4882 course details",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Computing Research Project"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Where can I find the Research Methods outline for REIT4882?",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Computing Research Project"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Open DECO3801 profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Build"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Show Design Computing Studio 3 syllabus",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Build"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Access DECO3800 course outline",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Proposal"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-        "query": "Show me the Design Computing Studio 3 - Proposal profile",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Design Computing Studio 3 - Proposal"},
-                {"action": "click", "element_description": "Course Profile"},
-                {"action": "click", "element_description": "View Profile"}
-            ]
-        }
-    },
-    {
-    "query": "Show COMP2041",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Theory of Computing"},
-            {"action": "click", "element_description": "Course Profile"},
-            {"action": "click", "element_description": "View Profile"}
-        ]
-    }
-},
-{
-    "query": "Artificial Intelligence syllabus",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Course Profile"},
-            {"action": "click", "element_description": "View Profile"}
-        ]
-    }
-},
-{
-    "query": "List all my courses",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"}
-        ]
-    }
-},
-{
-    "query": "Show me all my enrolled courses",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"}
-        ]
-    }
-},
-{
-    "query": "Display my course list",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"}
-        ]
-    }
-},
-{
-    "query": "Open all my courses",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"}
-        ]
-    }
-},
-{
-    "query": "View courses I am enrolled in",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"}
-        ]
-    }
-},
-{
-    "query": "Check my current courses",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"}
-        ]
-    }
-},
-{
-    "query": "List my subjects this semester",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"}
-        ]
-    }
-},
-{
-    "query": "Show enrolled subjects",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"}
-        ]
-    }
-},
-{
-    "query": "Open my current subject list",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"}
-        ]
-    }
-},
-{
-    "query": "Open AI course",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"}
-        ]
-    }
-},
-{
-    "query": "View COMP3702",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"}
-        ]
-    }
-},
-{
-    "query": "Go to Artificial Intelligence",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"}
-        ]
-    }
-},
-{
-    "query": "Show AI syllabus",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"}
-        ]
-    }
-},
-{
-    "query": "Open Software Engineering",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Software Engineering"}
-        ]
-    }
-},
-{
-    "query": "View BISM1201",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Transforming Business with Information Systems"}
-        ]
-    }
-},
-{
-    "query": "Open STAT1201 course",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Analysis of Scientific Data"}
-        ]
-    }
-},
-{
-    "query": "Go to ENGG1000",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Introduction to Professional Engineering"}
-        ]
-    }
-},
-{
-    "query": "Open Introduction to Engineering",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Introduction to Engineering"}
-        ]
-    }
-},
-{
-    "query": "Open DECO2500",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Human-Computer Interaction"}
-        ]
-    }
-},
-{
-    "query": "View DECO3800",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Design Computing Studio 3 - Proposal"}
-        ]
-    }
-},
-{
-    "query": "Open DECO3801",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Design Computing Studio 3 - Build"}
-        ]
-    }
-},
-{
-    "query": "Access REIT4882",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Computing Research Project"}
-        ]
-    }
-},
-{
-    "query": "Open REIT4842",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Research and Development Methods and Practice"}
-        ]
-    }
-},
-{
-    "query": "View REIT7842",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Research and Development Methods and Practice"}
-        ]
-    }
-},
-{
-        "query": "Open Timetable",
-        "plan": {
-            "steps": [
-                {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-                {"action": "click", "element_description": "My Timetable"},
-                {"action": "click", "element_description": "Timetable"},
-            ]
-        }
 
-    },
-    {
-    "query": "Show my full timetable",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-                {"action": "click", "element_description": "My Timetable"},
-                {"action": "click", "element_description": "Timetable"},
-        ]
-    }
-},
-{
-    "query": "Open my schedule for this week",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-                {"action": "click", "element_description": "My Timetable"},
-                {"action": "click", "element_description": "Timetable"},
-        ]
-    }
-},
-{
-    "query": "Display timetable showing all my enrolled courses",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-                {"action": "click", "element_description": "My Timetable"},
-                {"action": "click", "element_description": "Timetable"},
-        ]
-    }
-},
-{
-    "query": "Check my classes for today",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "My Timetable"},
-            {"action": "click", "element_description": "Timetable"}
-        ]
-    }
-},
-{
-    "query": "Show my lectures and tutorials",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "My Timetable"},
-            {"action": "click", "element_description": "Timetable"}
-        ]
-    }
-},
-{
-    "query": "Go to my weekly schedule",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "My Timetable"},
-            {"action": "click", "element_description": "Timetable"}
-        ]
-    }
-},
-{
-    "query": "Open my class timetable",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "My Timetable"},
-            {"action": "click", "element_description": "Timetable"}
-        ]
-    }
-},
-{
-    "query": "Check my grades",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-                {"action": "click", "element_description": "mySI-net"},
-                {"action": "click", "element_description": "Enrolments"},
-                {"action": "click", "element_description": "Study Report"},
-                {"action": "click", "element_description": "Studies Report"},
-        ]
-    }
-},
-
-{
-"query": "GRADES",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-                {"action": "click", "element_description": "mySI-net"},
-                {"action": "click", "element_description": "Enrolments"},
-                {"action": "click", "element_description": "Study Report"},
-                {"action": "click", "element_description": "Studies Report"},
-        ]
-    }
-},
-{
-    "query": "Display my academic results",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},
-{
-    "query": "Show me my marks",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},
-{
-    "query": "What are my course results?",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},
-{
-    "query": "How am I performing academically?",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},
-{
-    "query": "I want to see my scores",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},{
-"query": "To check my grades",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},
-{
-"query": "Grades",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},
-{
-    "query": "View my results",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},
-{
-    "query": "Show my semester results",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},
-{
-    "query": "Open my academic transcript",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"},
-            {"action": "click", "element_description": "Enrolments"},
-            {"action": "click", "element_description": "Study Report"},
-            {"action": "click", "element_description": "Studies Report"}
-        ]
-    }
-},
-{
-    "query": "To check my current fees",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-                {"action": "click", "element_description": "mySI-net"},
-        ]
-    }
-},
-{
-    "query": "View my current fees",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"}
-        ]
-    }
-},
-{
-    "query": "Show outstanding fees",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"}
-        ]
-    }
-},
-{
-    "query": "Check tuition fees",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"}
-        ]
-    }
-},
-{
-    "query": "Display my fees balance",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"}
-        ]
-    }
-},
-{
-    "query": "How much do I owe?",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"}
-        ]
-    }
-},
-{
-    "query": "My current student fees",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://portal.my.uq.edu.au/#/dashboard"},
-            {"action": "click", "element_description": "mySI-net"}
-        ]
-    }
-},
-{
-    "query": "library loans information",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://www.library.uq.edu.au/"},
-            {"action": "click", "element_description": "Log in"},
-            {"action": "click", "element_description": "Loans"},
-            {"action": "scrape", "element_description": "main content", 
-             "processing": "extract loan periods, due dates, renewal policies"}
-        ]
-    }
-},
-{
-    "query": "Check my library loans",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://www.library.uq.edu.au/"},
-            {"action": "click", "element_description": "Log in"},
-            {"action": "click", "element_description": "Loans"},
-            {"action": "scrape", "element_description": "main content", 
-             "processing": "extract loan periods, due dates, renewal policies"}
-        ]
-    }
-},
-{
-    "query": "View borrowed books and due dates",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://www.library.uq.edu.au/"},
-            {"action": "click", "element_description": "Log in"},
-            {"action": "click", "element_description": "Loans"},
-            {"action": "scrape", "element_description": "main content", 
-             "processing": "extract loan periods, due dates, renewal policies"}
-        ]
-    }
-},
-{
-    "query": "Show my current library checkouts",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://www.library.uq.edu.au/"},
-            {"action": "click", "element_description": "Log in"},
-            {"action": "click", "element_description": "Loans"},
-            {"action": "scrape", "element_description": "main content", 
-             "processing": "extract loan periods, due dates, renewal policies"}
-        ]
-    }
-},
-{
-    "query": "Library books I have on loan",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://www.library.uq.edu.au/"},
-            {"action": "click", "element_description": "Log in"},
-            {"action": "click", "element_description": "Loans"},
-            {"action": "scrape", "element_description": "main content", 
-             "processing": "extract loan periods, due dates, renewal policies"}
-        ]
-    }
-},
-{
-    "query": "Renewal and due dates for my library items",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://www.library.uq.edu.au/"},
-            {"action": "click", "element_description": "Log in"},
-            {"action": "click", "element_description": "Loans"},
-            {"action": "scrape", "element_description": "main content", 
-             "processing": "extract loan periods, due dates, renewal policies"}
-        ]
-    }
-},
-{
-    "query": "View my library account",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://www.library.uq.edu.au/"},
-            {"action": "click", "element_description": "Log in"},
-            {"action": "click", "element_description": "Loans"},
-            {"action": "scrape", "element_description": "main content",
-             "processing": "extract loan periods, due dates, renewal policies"}
-        ]
-    }
-},
-{
-    "query": "Show overdue library books",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://www.library.uq.edu.au/"},
-            {"action": "click", "element_description": "Log in"},
-            {"action": "click", "element_description": "Loans"},
-            {"action": "scrape", "element_description": "main content",
-             "processing": "extract loan periods, due dates, renewal policies"}
-        ]
-    }
-},
-{
-    "query": "What library books do I have out?",
-    "plan": {
-        "steps": [
-            {"action": "goto", "url": "https://www.library.uq.edu.au/"},
-            {"action": "click", "element_description": "Log in"},
-            {"action": "click", "element_description": "Loans"},
-            {"action": "scrape", "element_description": "main content",
-             "processing": "extract loan periods, due dates, renewal policies"}
+class NumpyBackend:
+    """
+    In-memory matrix of normalized embeddings searched by brute force.
+
+    For a few hundred examples one matrix product is cheaper than an HNSW
+    lookup. Nothing is persisted; the embedding cache makes rebuilding cheap.
+    """
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict] = []
+        self._positions: Dict[str, int] = {}
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def ids(self) -> Set[str]:
+        return set(self._ids)
+
+    def upsert(self, ids: List[str], embeddings: np.ndarray, documents: List[str], metadatas: List[Dict]):
+        vectors = self._normalize(embeddings)
+        if self._matrix.shape[0] == 0:
+            self._matrix = np.empty((0, vectors.shape[1]), dtype=np.float32)
+
+        new_rows = []
+        for row, example_id in enumerate(ids):
+            position = self._positions.get(example_id)
+            if position is None:
+                self._positions[example_id] = len(self._ids)
+                self._ids.append(example_id)
+                self._documents.append(documents[row])
+                self._metadatas.append(metadatas[row])
+                new_rows.append(row)
+            else:
+                self._documents[position] = documents[row]
+                self._metadatas[position] = metadatas[row]
+                self._matrix[position] = vectors[row]
+        if new_rows:
+            self._matrix = np.vstack([self._matrix, vectors[new_rows]])
+
+    def delete(self, ids: List[str]):
+        removed = set(ids)
+        keep = [i for i, example_id in enumerate(self._ids) if example_id not in removed]
+        self._ids = [self._ids[i] for i in keep]
+        self._documents = [self._documents[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._matrix = self._matrix[keep]
+        self._positions = {example_id: i for i, example_id in enumerate(self._ids)}
+
+    def query(self, embeddings: np.ndarray, k: int) -> List[List[Dict]]:
+        queries = self._normalize(embeddings)
+        n = len(self._ids)
+        if n == 0:
+            return [[] for _ in range(len(queries))]
+
+        k = min(k, n)
+        scores = queries @ self._matrix.T
+        if k < n:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(n), (len(queries), 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            [
+                {
+                    "id": self._ids[i],
+                    "document": self._documents[i],
+                    "metadata": self._metadatas[i],
+                    "distance": float(1.0 - score)
+                }
+                for i, score in zip(top[q], top_scores[q])
+            ]
+            for q in range(len(queries))
         ]
-    }
-},
-{
-        "query": "Open Artificial Intelligence Tutorial 1 pdf",
-        "plan": {
-            "steps": [
-                {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Tutorials"}
-                {"action": "click", "element_description": "Tutorial 1"}
-                {"action": "click", "element_description": "Tutorial 1 - Agent Design"}
-                {"action": "click", "element_description": "COMP3702_Tutorial_1.pdf"}
-            ]
-        }
-},
-{
-        "query": "Open Artificial Intelligence Tutorial 2 pdf",
-        "plan": {
-            "steps": [
-                {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Tutorials"}
-                {"action": "click", "element_description": "Tutorial 2"}
-                {"action": "click", "element_description": "Tutorial 2 - Search (BFS & DFS)"}
-                {"action": "click", "element_description": "COMP3702_Tutorial_2.pdf"}
-            ]
-        }
-},
-{
-        "query": "Open Artificial Intelligence Tutorial 3 pdf",
-        "plan": {
-            "steps": [
-                {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Tutorials"}
-                {"action": "click", "element_description": "Tutorial 3"}
-                {"action": "click", "element_description": "Tutorial 3 - Search (incl. A*)"}
-                {"action": "click", "element_description": "COMP3702_Tutorial_3.pdf"}
-            ]
-        }
-},
-{
-        "query": "Open Artificial Intelligence Tutorial 1 solutions pdf",
-        "plan": {
-            "steps": [
-                {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Tutorials"}
-                {"action": "click", "element_description": "Tutorial 1"}
-                {"action": "click", "element_description": "Tutorial 1 - Solutions"}
-                {"action": "click", "element_description": "COMP3702_Tutorial_1_soln.pdf"}
-            ]
-        }
-},
-{
-        "query": "Open Artificial Intelligence Tutorial 2 solution pdf",
-        "plan": {
-            "steps": [
-                {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Tutorials"}
-                {"action": "click", "element_description": "Tutorial 2"}
-                {"action": "click", "element_description": "Tutorial 2 - Solutions"}
-                {"action": "click", "element_description": "COMP3702_Tutorial_2_soln.pdf"}
-            ]
-        }
-},
-{
-        "query": "Open Artificial Intelligence Tutorial 3 solutions pdf",
-        "plan": {
-            "steps": [
-                {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Tutorials"}
-                {"action": "click", "element_description": "Tutorial 3"}
-                {"action": "click", "element_description": "Tutorial 3 - Solutions"}
-                {"action": "click", "element_description": "COMP3702_Tutorial_1_soln.pdf"}
-            ]
-        }
-},
-{
-        "query": "Open Artificial Intelligence Tutorial 3 solution slides",
-        "plan": {
-            "steps": [
-                {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-                {"action": "click", "element_description": "Artificial Intelligence"},
-                {"action": "click", "element_description": "Tutorials"}
-                {"action": "click", "element_description": "Tutorial 3"}
-                {"action": "click", "element_description": "Tutorial 3 - Solutions"}
-                {"action": "click", "element_description": "COMP3702_Tutorial_3_soln_slides.pdf"}
-            ]
+
+
+class OnnxEncoder:
+    """
+    all-MiniLM-L6-v2 exported to ONNX with int8 weights, run on onnxruntime.
+
+    Implements the part of the SentenceTransformer API that ExampleVectorDB
+    uses. Pooling and normalization match the sentence-transformers pipeline
+    (mean over the attention mask, then L2).
+    """
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, batch_size: int = 32):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, "encoder_config.json"), "r", encoding="utf-8") as f:
+            config = json.load(f)
+        self.dim = config["dim"]
+        self.batch_size = batch_size
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=config["max_seq_length"])
+        self.tokenizer.enable_padding(pad_id=config["pad_token_id"], pad_token=config["pad_token"])
+
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, config["model_file"]),
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + self.batch_size])
+            input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+            attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+            batches.append(pooled.astype(np.float32))
+
+        if not batches:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.vstack(batches)
+
+
+class ExampleVectorDB:
+    def __init__(self, backend, encoder=None, query_cache_size: int = QUERY_CACHE_SIZE,
+                 result_cache_size: int = RESULT_CACHE_SIZE, encoder_name: str = MODEL_NAME,
+                 embedding_cache_dir: str = EMBEDDING_CACHE_DIR,
+                 learned_path: str = LEARNED_EXAMPLES_PATH, learned_max: int = LEARNED_EXAMPLES_MAX,
+                 courses_path: str = COURSES_PATH):
+        if encoder is None:
+            encoder = load_encoder("torch")
+        self.encoder = encoder
+        self.backend = backend
+        self.examples = []
+        self.examples_path = None
+        self.examples_mtime = None
+        # {"query", "plan"} examples added by learn(), oldest first
+        self.learned: List[Dict] = []
+        self.learned_path = learned_path
+        self.learned_max = learned_max
+        self.courses = CourseTable()
+        self.courses_path = courses_path
+        self.courses_mtime = None
+        # plan_id -> plan JSON; examples and index entries only hold the id
+        self.plans: Dict[str, str] = {}
+        self.lexical_index = LexicalIndex()
+        # Keyed by normalized prompt; results are dropped whenever the index changes
+        self.query_cache = LRUCache(query_cache_size)
+        self.result_cache = LRUCache(result_cache_size)
+        self.embedding_cache = EmbeddingCache(
+            embedding_cache_dir,
+            encoder_name,
+            self.encoder.get_sentence_embedding_dimension()
+        )
+        # Prompts encoded since the query cache was last saved
+        self._unsaved_prompts = 0
+        self._load_saved_prompts()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed example texts through the on-disk embedding cache"""
+        return self.embedding_cache.encode(texts, self.encoder)
+
+    def _load_saved_prompts(self):
+        """Fill the query cache from the embedding cache, so frequent prompts skip encoding after a restart"""
+        for key, vector in self.embedding_cache.load_prompts():
+            self.query_cache.put(key, vector)
+
+    def save_embeddings(self):
+        """Write new example embeddings and the query cache's prompts to the embedding cache"""
+        # A process without a query cache leaves the saved prompts alone
+        if self.query_cache.maxsize > 0:
+            self.embedding_cache.save_prompts(self.query_cache.items())
+        self.embedding_cache.flush(keep={text_hash(ex["query"]) for ex in self.examples})
+        self._unsaved_prompts = 0
+
+    def sync_examples(self, examples) -> Dict[str, int]:
+        """
+        Bring the index in line with `examples`, which may be any iterable.
+
+        Examples are keyed by their content hash, so only added or changed
+        examples are embedded and removed or changed ones are deleted. New
+        examples are embedded in chunks as they stream in.
+        """
+        existing = self.backend.ids()
+        seen = set()
+        pending = []
+        added = 0
+
+        self.plans = {}
+        self.examples = []
+        self.lexical_index.clear()
+        self.result_cache.clear()
+
+        for ex in examples:
+            example_id = example_hash(ex)
+            if example_id in seen:
+                continue
+            seen.add(example_id)
+            self.examples.append({"query": ex["query"], "plan_id": self.intern_plan(ex["plan"])})
+            if example_id not in existing:
+                pending.append(ex)
+                if len(pending) >= SYNC_BATCH_SIZE:
+                    self.add_examples(pending)
+                    added += len(pending)
+                    pending = []
+        if pending:
+            self.add_examples(pending)
+            added += len(pending)
+        self.save_embeddings()
+        self.lexical_index.add(self.examples)
+
+        stale = [example_id for example_id in existing if example_id not in seen]
+        if stale:
+            self.backend.delete(stale)
+
+        stats = {
+            "added": added,
+            "removed": len(stale),
+            "unchanged": len(seen) - added
+        }
+        print(f"Vector DB sync: {stats['added']} added, {stats['removed']} removed, "
+              f"{stats['unchanged']} unchanged")
+        return stats
+
+    def load_examples(self, path: Optional[str] = None) -> Dict[str, int]:
+        """(Re)load the corpus and learned examples, embedding only what changed"""
+        path = path or EXAMPLES_PATH
+        mtime = os.path.getmtime(path)
+        self.load_courses()
+        if os.path.exists(self.learned_path):
+            self.learned = get_examples(self.learned_path)[-self.learned_max:]
+        stats = self.sync_examples(itertools.chain(iter_examples(path), self.learned))
+        self.examples_path = path
+        self.examples_mtime = mtime
+        return stats
+
+    def load_courses(self):
+        """(Re)load the course table; prompt caches are keyed by the masked prompt"""
+        if not os.path.exists(self.courses_path):
+            return
+        self.courses_mtime = os.path.getmtime(self.courses_path)
+        self.courses = CourseTable(get_courses(self.courses_path))
+        self.query_cache.clear()
+        self.result_cache.clear()
+        # Saved embeddings are keyed by the masked prompt they were computed for, so they stay valid
+        self._load_saved_prompts()
+
+    def reload_if_changed(self) -> bool:
+        """Pick up replaced examples or course files; costs two stat()s when nothing changed"""
+        if self.examples_path is None:
+            return False
+        try:
+            if os.path.getmtime(self.courses_path) != self.courses_mtime:
+                print(f"{self.courses_path} changed, reloading courses")
+                self.load_courses()
+        except OSError:
+            pass
+        try:
+            mtime = os.path.getmtime(self.examples_path)
+        except OSError:
+            return False
+        if mtime == self.examples_mtime:
+            return False
+        print(f"{self.examples_path} changed, reloading examples")
+        self.load_examples(self.examples_path)
+        return True
+
+    def add_examples(self, examples: List[Dict]):
+        """Embed examples and upsert them into the vector database"""
+        if not examples:
+            return
+
+        texts = [ex["query"] for ex in examples]
+        embeddings = self.encode(texts)
+        ids = [example_hash(ex) for ex in examples]
+        plan_ids = [self.intern_plan(ex["plan"]) for ex in examples]
+        metadatas = [{"plan_id": plan_id} for plan_id in plan_ids]
+
+        self.backend.upsert(ids, embeddings, texts, metadatas)
+        self.lexical_index.add([{"query": text, "plan_id": plan_id} for text, plan_id in zip(texts, plan_ids)])
+        self.result_cache.clear()
+
+    def learn(self, prompt: str, plan: Dict) -> bool:
+        """
+        Add a prompt whose plan ran successfully to the index and the learned file.
+
+        Prompts already in the index, word for word, are skipped. Beyond
+        learned_max learned examples the oldest are removed again. Returns
+        True if the prompt was added.
+        """
+        if not plan or not plan.get("steps"):
+            return False
+        # Learn "check COMP3710 announcements" as "check {course} announcements"
+        templated = self.courses.templatize(prompt, plan)
+        if templated:
+            prompt, plan = templated
+        normalized = normalize_query(prompt)
+        if not normalized or normalized in self.lexical_index.by_text:
+            return False
+
+        example = {"query": prompt, "plan": plan}
+        self.add_examples([example])
+        self.examples.append({"query": prompt, "plan_id": self.intern_plan(plan)})
+        self.learned.append(example)
+
+        evicted = self.learned[:-self.learned_max] if self.learned_max else self.learned
+        if evicted:
+            self.learned = self.learned[len(evicted):]
+            self.backend.delete([example_hash(ex) for ex in evicted])
+            dropped = {(ex["query"], plan_hash(ex["plan"])) for ex in evicted}
+            self.examples = [ex for ex in self.examples if (ex["query"], ex["plan_id"]) not in dropped]
+            self.lexical_index.clear()
+            self.lexical_index.add(self.examples)
+            self.result_cache.clear()
+
+        self.save_embeddings()
+        self._save_learned()
+        return example in self.learned
+
+    def _save_learned(self):
+        tmp_path = self.learned_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"format": EXAMPLES_FORMAT, "version": EXAMPLES_VERSION}) + "\n")
+            for ex in self.learned:
+                f.write(json.dumps(ex) + "\n")
+        os.replace(tmp_path, self.learned_path)
+
+    def intern_plan(self, plan: Dict) -> str:
+        """Store a plan in the plan table once and return its id"""
+        plan_id = plan_hash(plan)
+        if plan_id not in self.plans:
+            self.plans[plan_id] = json.dumps(plan)
+        return plan_id
+
+    def get_plan_by_id(self, plan_id: str, course: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Decode a plan from the plan table; each call returns a fresh copy.
+
+        Template slots are filled from `course`; returns None if the plan
+        has a slot that can't be filled.
+        """
+        plan = self.plans.get(plan_id)
+        if plan is None:
+            return None
+        return fill_slots(plan, CourseTable.slot_values(course))
+
+    def plan_course_code(self, plan_id: str) -> Optional[str]:
+        """The course code a plan is restricted to, or None if it works for any course"""
+        plan = self.plans.get(plan_id)
+        return json.loads(plan).get("course_code") if plan else None
+
+    def get_similar_examples(self, query: str, k: int = 3) -> List[Dict]:
+        """Retrieve the k most similar examples as {"query", "plan_id", "score"}"""
+        return self.get_similar_examples_batch([query], k)[0]
+
+    def get_similar_examples_batch(self, queries: List[str], k: int = 3) -> List[List[Dict]]:
+        """
+        Retrieve the k most similar examples for each of `queries`.
+
+        Prompts not in the result cache are encoded in a single call and sent
+        to the backend as one query. Course mentions are replaced by the
+        {course} slot first, so they match plan templates. Each result is
+        {"query", "plan_id", "score"} with score the cosine similarity.
+        """
+        queries = [self.courses.template_query(query) for query in queries]
+        results: List[Optional[List[Dict]]] = []
+        pending = []
+        for i, query in enumerate(queries):
+            cached = self.result_cache.get((normalize_query(query), k))
+            results.append(cached)
+            if cached is None:
+                pending.append(i)
+
+        if pending:
+            embeddings = self.query_embeddings([queries[i] for i in pending])
+            for i, matches in zip(pending, self.backend.query(embeddings, k)):
+                similar_examples = []
+                for match in matches:
+                    similar_examples.append({
+                        "query": match["document"],
+                        "plan_id": match["metadata"]["plan_id"],
+                        "score": 1.0 - match["distance"]
+                    })
+                self.result_cache.put((normalize_query(queries[i]), k), similar_examples)
+                results[i] = similar_examples
+
+        return [[dict(example) for example in similar_examples] for similar_examples in results]
+
+    def query_embeddings(self, queries: List[str]) -> np.ndarray:
+        """Embeddings of prompts as an (n, dim) array, encoding all LRU misses in one call"""
+        keys = [normalize_query(query) for query in queries]
+        vectors = [self.query_cache.get(key) for key in keys]
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            encoded = np.asarray(self.encoder.encode([queries[i] for i in missing]), dtype=np.float32)
+            for row, i in enumerate(missing):
+                vectors[i] = encoded[row]
+                self.query_cache.put(keys[i], encoded[row])
+            # Only what the LRU still holds is saved, so the cache stays bounded
+            self._unsaved_prompts += len(missing) if self.query_cache.maxsize > 0 else 0
+            if self._unsaved_prompts >= PROMPT_SAVE_INTERVAL:
+                self.save_embeddings()
+
+        if not vectors:
+            return np.empty((0, self.embedding_cache.dim), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters for sizing the prompt caches"""
+        return {
+            "query_embeddings": self.query_cache.stats(),
+            "results": self.result_cache.stats()
         }
-},
-{
-    "query": "Open AI Tutorial 1 PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 1"},
-            {"action": "click", "element_description": "Tutorial 1 - Agent Design"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_1.pdf"}
-        ]
-    }
-},
-{
-    "query": "Access AI Tutorial 2 PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 2"},
-            {"action": "click", "element_description": "Tutorial 2 - Search (BFS & DFS)"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_2.pdf"}
-        ]
-    }
-},
-{
-    "query": "Download AI Tutorial 3 PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 3"},
-            {"action": "click", "element_description": "Tutorial 3 - Search (incl. A*)"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_3.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Tutorial 1 Solutions PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 1"},
-            {"action": "click", "element_description": "Tutorial 1 - Solutions"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_1_soln.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Tutorial 2 Solutions PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 2"},
-            {"action": "click", "element_description": "Tutorial 2 - Solutions"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_2_soln.pdf"}
-        ]
-    }
-},
-{
-    "query": "Download Tutorial 3 Solutions PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 3"},
-            {"action": "click", "element_description": "Tutorial 3 - Solutions"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_3_soln.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Tutorial 3 Solution Slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 3"},
-            {"action": "click", "element_description": "Tutorial 3 - Solutions"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_3_soln_slides.pdf"}
-        ]
-    }
-},
-{
-    "query": "Fetch AI Tutorial 1 PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 1"},
-            {"action": "click", "element_description": "Tutorial 1 - Agent Design"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_1.pdf"}
-        ]
-    }
-},
-{
-    "query": "Get AI Tutorial 2 PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 2"},
-            {"action": "click", "element_description": "Tutorial 2 - Search (BFS & DFS)"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_2.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Tutorial 1 Solution PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 1"},
-            {"action": "click", "element_description": "Tutorial 1 - Solutions"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_1_soln.pdf"}
-        ]
-    }
-},
-{
-    "query": "Access Tutorial 2 Solution PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 2"},
-            {"action": "click", "element_description": "Tutorial 2 - Solutions"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_2_soln.pdf"}
-        ]
-    }
-},
-
-{
-    "query": "Open slides for Tutorial 3 solutions",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 3"},
-            {"action": "click", "element_description": "Tutorial 3 - Solutions"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_3_soln_slides.pdf"}
-        ]
-    }
-},
-{
-    "query": "Retrieve AI Tutorial 1 material",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 1"},
-            {"action": "click", "element_description": "Tutorial 1 - Agent Design"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_1.pdf"}
-        ]
-    }
-},
-{
-    "query": "Access Tutorial 2 content PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 2"},
-            {"action": "click", "element_description": "Tutorial 2 - Search (BFS & DFS)"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_2.pdf"}
-        ]
-    }
-},
-{
-    "query": "open week 1 AI slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"},
-        ]
-    }
-},
-{
-    "query": "open week 1 AI slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"},
-        ]
-    }
-},
-{
-    "query": "Access AI Week 1 lecture slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Download AI Week 1 lecture PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open AI Week 2 lecture slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Fetch AI Week 2 lecture PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Retrieve AI Week 1 lecture material",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Get AI Week 2 lecture notes PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Week 1 AI slides PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Week 2 AI lecture notes",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Access AI Week 1 lecture slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Download AI Week 1 lecture PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open AI Week 2 lecture slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Fetch AI Week 2 lecture PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Retrieve AI Week 1 lecture material",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Get AI Week 2 lecture notes PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Week 1 AI slides PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Week 2 AI lecture notes",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Artificial Intelligence Week 1 lecture slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Download Artificial Intelligence Week 1 PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Access Artificial Intelligence Week 2 lecture slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Fetch Artificial Intelligence Week 2 PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 1: Search"},
-            {"action": "click", "element_description": "COMP3702_Module-1_Search.pdf"}
-        ]
-    }
-},
-{
-    "query": "Retrieve Artificial Intelligence Week 1 lecture material",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Introduction"},
-            {"action": "click", "element_description": "Module 0: Introduction"},
-            {"action": "click", "element_description": "COMP3702_Module-0_IntroToAI.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Artificial Intelligence Week 3 lecture slides",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 2: Advanced Search"},
-            {"action": "click", "element_description": "COMP3702_Module-2_AdvancedSearch.pdf"}
-        ]
-    }
-},
-{
-    "query": "Download Artificial Intelligence Week 3 PDF notes",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Search: Week 2 & 3"},
-            {"action": "click", "element_description": "Module 2: Advanced Search"},
-            {"action": "click", "element_description": "COMP3702_Module-2_AdvancedSearch.pdf"}
-        ]
-    }
-},
-{
-    "query": "Access Artificial Intelligence Week 1 tutorial PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 1"},
-            {"action": "click", "element_description": "Tutorial 1 - Agent Design"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_1.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Artificial Intelligence Week 2 tutorial PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Tutorials"},
-            {"action": "click", "element_description": "Tutorial 2"},
-            {"action": "click", "element_description": "Tutorial 2 - Search (BFS & DFS)"},
-            {"action": "click", "element_description": "COMP3702_Tutorial_2.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Artificial Intelligence Assignment 0",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 0 - 2025"},
-            {"action": "click", "element_description": "Assignment 0 - Task Description"},
-            {"action": "click", "element_description": "COMP3702_2025_Assignment-0.pdf"}
-        ]
-    }
-},
-{
-    "query": "Open Artificial Intelligence Assessignment 1",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 1 - 2025"},
-            {"action": "click", "element_description": "Assignment 1 - Task Description"},
-            {"action": "click", "element_description": "COMP3702_2025_Assignment-1.pdf"}
-        ]
-    }
-},
-
-{
-    "query": "To Submit Artificial Intelligence Assignment 0 Code",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 0 - 2025"},
-            {"action": "click", "element_description": "Assignment 0 - Code"},
-            {"action": "click", "element_description": "Launch"}
-        ]
-    }
-},
-{
-    "query": "To submit Artificial Intelligence Assessignment 0 Report",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 0 - 2025"},
-            {"action": "click", "element_description": "Assignment 0 - Report"},
-            {"action": "click", "element_description": "Launch"}
-        ]
-    }
-},
-{
-    "query": "Open AI Assignment 0 PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 0 - 2025"},
-            {"action": "click", "element_description": "Assignment 0 - Task Description"},
-            {"action": "click", "element_description": "COMP3702_2025_Assignment-0.pdf"}
-        ]
-    }
-},
-{
-    "query": "Access Artificial Intelligence Assignment 1 PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 1 - 2025"},
-            {"action": "click", "element_description": "Assignment 1 - Task Description"},
-            {"action": "click", "element_description": "COMP3702_2025_Assignment-1.pdf"}
-        ]
-    }
-},
-{
-    "query": "Submit code for AI Assignment 0",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 0 - 2025"},
-            {"action": "click", "element_description": "Assignment 0 - Code"},
-            {"action": "click", "element_description": "Launch"}
-        ]
-    }
-},
-{
-    "query": "Submit AI Assignment 0 report",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 0 - 2025"},
-            {"action": "click", "element_description": "Assignment 0 - Report"},
-            {"action": "click", "element_description": "Launch"}
-        ]
-    }
-},
-{
-    "query": "Launch Assignment 1 task PDF for Artificial Intelligence",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 1 - 2025"},
-            {"action": "click", "element_description": "Assignment 1 - Task Description"},
-            {"action": "click", "element_description": "COMP3702_2025_Assignment-1.pdf"}
-        ]
-    }
-},
-{
-    "query": "Upload code for Artificial Intelligence Assignment 0",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 0 - 2025"},
-            {"action": "click", "element_description": "Assignment 0 - Code"},
-            {"action": "click", "element_description": "Launch"}
-        ]
-    }
-},
-{
-    "query": "Upload report for AI Assignment 0",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 0 - 2025"},
-            {"action": "click", "element_description": "Assignment 0 - Report"},
-            {"action": "click", "element_description": "Launch"}
-        ]
-    }
-},
-{
-    "query": "Open AI Assignment 0 task description PDF",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://learn.uq.edu.au/ultra/course"},
-            {"action": "click", "element_description": "Artificial Intelligence"},
-            {"action": "click", "element_description": "Assessment"},
-            {"action": "click", "element_description": "Assignment 0 - 2025"},
-            {"action": "click", "element_description": "Assignment 0 - Task Description"},
-            {"action": "click", "element_description": "COMP3702_2025_Assignment-0.pdf"}
-        ]
-    }
-},
-{
-    "query": "To book Group meeting rooms",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://uqbookit.uq.edu.au/app/booking-types"},
-            {"action": "click", "element_description": "Library rooms"},
-            {"action": "click", "element_description": "Group meeting rooms"},
-            {"action": "click", "element_description": "12N204A Central Library"},
-            {"action": "click", "element_description": "Show availability"},
-        ]
-    },
-},
-{
-    "query": "To book One-person meeting booth",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://uqbookit.uq.edu.au/app/booking-types"},
-            {"action": "click", "element_description": "Library rooms"},
-            {"action": "click", "element_description": "One-person meeting booth"},
-            {"action": "click", "element_description": "12N204-01 Central Library"},
-            {"action": "click", "element_description": "Show availability"},
-        ]
-    }
-
-},
-{
-    "query": "To book Two-person meeting booth",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://uqbookit.uq.edu.au/app/booking-types"},
-            {"action": "click", "element_description": "Library rooms"},
-            {"action": "click", "element_description": "Two-person meeting booth"},
-            {"action": "click", "element_description": "12-N121-01 Central Library"},
-            {"action": "click", "element_description": "Show availability"},
-        ]
-    }
-
-},
-{
-    "query": "Reserve a group study room",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://uqbookit.uq.edu.au/app/booking-types"},
-            {"action": "click", "element_description": "Library rooms"},
-            {"action": "click", "element_description": "Group meeting rooms"},
-            {"action": "click", "element_description": "12N204A Central Library"},
-            {"action": "click", "element_description": "Show availability"}
-        ]
-    }
-},
-{
-    "query": "Book a one-person booth in library",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://uqbookit.uq.edu.au/app/booking-types"},
-            {"action": "click", "element_description": "Library rooms"},
-            {"action": "click", "element_description": "One-person meeting booth"},
-            {"action": "click", "element_description": "12N204-01 Central Library"},
-            {"action": "click", "element_description": "Show availability"}
-        ]
-    }
-},
-{
-    "query": "Reserve a two-person study booth",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://uqbookit.uq.edu.au/app/booking-types"},
-            {"action": "click", "element_description": "Library rooms"},
-            {"action": "click", "element_description": "Two-person meeting booth"},
-            {"action": "click", "element_description": "12-N121-01 Central Library"},
-            {"action": "click", "element_description": "Show availability"}
-        ]
-    }
-},
-{
-    "query": "Check availability of group meeting rooms",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://uqbookit.uq.edu.au/app/booking-types"},
-            {"action": "click", "element_description": "Library rooms"},
-            {"action": "click", "element_description": "Group meeting rooms"},
-            {"action": "click", "element_description": "12N204A Central Library"},
-            {"action": "click", "element_description": "Show availability"}
-        ]
-    }
-},
-{
-    "query": "Reserve a private single-person booth",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://uqbookit.uq.edu.au/app/booking-types"},
-            {"action": "click", "element_description": "Library rooms"},
-            {"action": "click", "element_description": "One-person meeting booth"},
-            {"action": "click", "element_description": "12N204-01 Central Library"},
-            {"action": "click", "element_description": "Show availability"}
-        ]
-    }
-},
-{
-    "query": "Book a study booth for two people",
-    "plan": {
-        "steps": [
-            {"action": "goto", "element_description": "https://uqbookit.uq.edu.au/app/booking-types"},
-            {"action": "click", "element_description": "Library rooms"},
-            {"action": "click", "element_description": "Two-person meeting booth"},
-            {"action": "click", "element_description": "12-N121-01 Central Library"},
-            {"action": "click", "element_description": "Show availability"}
-        ]
-    }
-}
 
-]
+    def match_plan(self, prompt: str, min_similarity: Optional[float] = None,
+                   min_margin: Optional[float] = None) -> Dict:
+        """
+        Resolve a prompt to a plan, trying the lexical index before semantic search.
+
+        Returns {"plan_id", "plan", "source", "score", "margin", "reason"}
+        where source is "exact", "course_code" or "semantic". A semantic
+        match must score at least `min_similarity` and beat the best example
+        for another plan by `min_margin` (defaults: MIN_SIMILARITY,
+        MIN_MARGIN). Otherwise "plan" is None and "reason" says why, so the
+        caller can give up before touching the browser. Only the chosen plan
+        is decoded, with its {course} slot filled from the course named in
+        the prompt. A plan with a "course_code" only works for that course:
+        it fills the slot when the prompt names no course and is refused
+        when the prompt names another.
+        """
+        min_similarity = MIN_SIMILARITY if min_similarity is None else min_similarity
+        min_margin = MIN_MARGIN if min_margin is None else min_margin
+        self.reload_if_changed()
+        course = self.courses.find(prompt)
+        query = self.courses.mask(prompt, course) if course else prompt
+        match = {"plan_id": None, "plan": None, "source": None, "score": None, "margin": None, "reason": None}
+
+        plan_id, source = self.lexical_index.lookup(query)
+        if plan_id is not None:
+            match.update(plan_id=plan_id, source=source, score=1.0)
+        else:
+            similar_examples = self.get_similar_examples(prompt, k=MARGIN_CANDIDATES)
+            if not similar_examples:
+                match["reason"] = "no examples are indexed"
+                return match
+            score, margin = match_confidence(similar_examples)
+            best = similar_examples[0]
+            match.update(plan_id=best["plan_id"], source="semantic", score=score, margin=margin)
+            if score < min_similarity:
+                match["reason"] = (f"closest example \"{best['query']}\" has similarity {score:.2f}, "
+                                   f"below {min_similarity:.2f}")
+                return match
+            if margin is not None and margin < min_margin:
+                runner_up = next(ex for ex in similar_examples if ex["plan_id"] != best["plan_id"])
+                match["reason"] = (f"ambiguous between \"{best['query']}\" ({score:.2f}) and "
+                                   f"\"{runner_up['query']}\" ({runner_up['score']:.2f})")
+                return match
+
+        plan_course_code = self.plan_course_code(match["plan_id"])
+        if plan_course_code:
+            if course is not None and course.get("code") != plan_course_code:
+                match["reason"] = f"the matching plan only works for {plan_course_code}"
+                return match
+            course = self.courses.by_code.get(plan_course_code)
+
+        match["plan"] = self.get_plan_by_id(match["plan_id"], course)
+        if match["plan"] is None:
+            match["reason"] = "the matching plan needs a course, but no known course was named"
+        return match
+
+    def get_plan(self, prompt: str) -> Dict:
+        """Return the best plan for a prompt, or an empty plan"""
+        return self.match_plan(prompt)["plan"] or {"steps": []}
+
+def iter_examples(path: Optional[str] = None):
+    """Stream examples from a JSONL data file whose first line is a format header"""
+    path = path or EXAMPLES_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != EXAMPLES_FORMAT or header.get("version") not in range(1, EXAMPLES_VERSION + 1):
+            raise ValueError(f"{path} is not a version 1-{EXAMPLES_VERSION} navigation examples file")
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def count_examples(path: Optional[str] = None) -> int:
+    """Number of examples in a data file, without parsing them"""
+    with open(path or EXAMPLES_PATH, "rb") as f:
+        return sum(1 for line in f if line.strip()) - 1
+
+
+def get_examples(path: Optional[str] = None) -> List[Dict]:
+    return list(iter_examples(path))
+
+
+def get_courses(path: Optional[str] = None) -> List[Dict]:
+    """Read the course table, a JSONL file with a format header like the examples"""
+    path = path or COURSES_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != COURSES_FORMAT or header.get("version") != COURSES_VERSION:
+            raise ValueError(f"{path} is not a version {COURSES_VERSION} course table")
+        return [json.loads(line) for line in f if line.strip()]